@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+""" Benchmark of startup time and memory of eager and lazy loading
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from models.base import DATA
+from models.user import User
+
+USERS = 100000
+LOOKUPS = 100
+FIRST = datetime(2020, 1, 1)
+
+
+def populate(users: int):
+    """ Write a snapshot of users in both formats, one user created
+    every minute and updated half a minute later, as real stores do
+    """
+    User.BATCH_SIZE = users + 1
+    User.load_from_file()
+    for i in range(users):
+        user = User(email="user{}@example.com".format(i))
+        user.password = "pwd{}".format(i)
+        user.save()
+        user.created_at = FIRST + timedelta(minutes=i)
+        user.updated_at = user.created_at + timedelta(seconds=30)
+    User.flush()
+    User.SNAPSHOT = "binary"
+    User.load_from_file()
+    User.SNAPSHOT = "json"
+
+
+def startup() -> float:
+    """ Seconds to load the snapshot and serve LOOKUPS requests
+    """
+    start = time.perf_counter()
+    User.load_from_file()
+    for i in range(LOOKUPS):
+        User.search({'email': "user{}@example.com".format(i * 997)})
+    return time.perf_counter() - start
+
+
+def resident() -> float:
+    """ MiB held by DATA after loading and serving LOOKUPS requests
+    """
+    DATA.clear()
+    tracemalloc.start()
+    startup()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / (1 << 20)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        populate(USERS)
+        print("{:>8} {:>6} {:>10} {:>8}".format(
+            'snapshot', 'load', 'startup s', 'MiB'))
+        for snapshot in ("json", "binary"):
+            for load in ("eager", "lazy"):
+                User.SNAPSHOT = snapshot
+                User.LOAD = load
+                User.load_from_file()
+                seconds = min(startup() for _ in range(3))
+                print("{:>8} {:>6} {:>10.3f} {:>8.1f}".format(
+                    snapshot, load, seconds, resident()))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+""" Benchmark of bytes per User instance and of User.to_json
+"""
+import sys
+import time
+import tracemalloc
+from models.user import User
+
+USERS = 100000
+NOW = "2024-01-01T00:00:00"
+
+
+def build(users: int) -> list:
+    """ Users loaded from serialized fields, as load_from_file builds
+    them; timestamps are strings so the dict-based model runs it too
+    """
+    return [User(id=str(i), created_at=NOW, updated_at=NOW,
+                 email="user{}@example.com".format(i), _password="hash",
+                 first_name="First", last_name="Last")
+            for i in range(users)]
+
+
+def bytes_per_user(users: int) -> float:
+    """ Traced bytes per instance, its own id and email strings excluded
+    """
+    strings = sum(sys.getsizeof(str(i)) +
+                  sys.getsizeof("user{}@example.com".format(i))
+                  for i in range(users))
+    tracemalloc.start()
+    objs = build(users)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return (size - strings) / users
+
+
+def to_json_us(objs: list, for_serialization: bool) -> float:
+    """ Microseconds per to_json call, best of 5 passes
+    """
+    best = None
+    for _ in range(5):
+        start = time.perf_counter()
+        for obj in objs:
+            obj.to_json(for_serialization)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(objs) * 1e6
+
+
+if __name__ == "__main__":
+    objs = build(USERS)
+    print("bytes/user        {:>8.0f}".format(bytes_per_user(USERS)))
+    print("to_json us        {:>8.2f}".format(to_json_us(objs, False)))
+    print("to_json(True) us  {:>8.2f}".format(to_json_us(objs, True)))
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+""" Benchmark of User creation throughput per storage and batching mode
+"""
+import os
+import tempfile
+import time
+from models.base import DATA
+from models.user import User
+
+USERS = 2000
+MODES = [
+    # (STORAGE, BATCH_SIZE, BATCH_INTERVAL, DURABILITY)
+    ("file", 1, 0, "os"),
+    ("file", 100, 0, "os"),
+    ("file", 1000000, 0.05, "os"),
+    ("journal", 1, 0, "os"),
+    ("journal", 100, 0, "os"),
+    ("journal", 1, 0, "fsync"),
+    ("journal", 100, 0, "fsync"),
+]
+
+
+def create(users: int) -> float:
+    """ Create users, flush them and return users per second
+    """
+    start = time.perf_counter()
+    for i in range(users):
+        user = User(email="user{}@example.com".format(i))
+        user.password = "pwd{}".format(i)
+        user.save()
+    User.flush()
+    return users / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    print("{:>8} {:>8} {:>9} {:>6} {:>10}".format(
+        'storage', 'batch', 'interval', 'sync', 'users/s'))
+    for storage, size, interval, durability in MODES:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            User.STORAGE = storage
+            User.BATCH_SIZE = size
+            User.BATCH_INTERVAL = interval
+            User.DURABILITY = durability
+            User.JOURNAL_MAX_SIZE = 1 << 30
+            User.load_from_file()
+            rate = create(USERS)
+            User.load_from_file()
+            assert len(DATA['User']) == USERS
+        print("{:>8} {:>8} {:>9} {:>6} {:>10.0f}".format(
+            storage, size, interval, durability, rate))
@@ -1,39 +1,223 @@
 #!/usr/bin/env python3
 """ Base module
 """
-from datetime import datetime
+from array import array
+from datetime import datetime, timedelta
 from typing import TypeVar, List, Iterable
-from os import path
+from os import getenv, path
+import atexit
 import json
+import logging
+import os
+import threading
 import uuid
+from models import snapshot
 
 
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+DATES = ('created_at', 'updated_at')
 DATA = {}
+INDEX = {}
+INDEXED = {}
+PENDING = {}
+TIMERS = {}
+LOCK = threading.RLock()
+
+
+def format_datetime(value: datetime) -> str:
+    """ value.strftime(TIMESTAMP_FORMAT), through the faster isoformat
+    when both give the same text
+    """
+    if value.tzinfo is None and value.year >= 1000:
+        return value.isoformat(timespec='seconds')
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+def to_seconds(values: list) -> array:
+    """ TIMESTAMP_FORMAT strings as an array('q') of epoch seconds, or
+    None if one of the values is not such a string
+    """
+    seconds = array('q')
+    parsed = {}
+    for value in values:
+        second = parsed.get(value)
+        if second is None:
+            try:
+                date = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                return None
+            if format_datetime(date) != value:
+                return None
+            second = (date - snapshot.EPOCH) // snapshot.SECOND
+            parsed[value] = second
+        seconds.append(second)
+    return seconds
+
+
+class Records(dict):
+    """ Objects of one class by id; a value may still be the row number
+    of the object in the columns it was loaded from, until a read builds
+    the object. A date column without None is kept as an array('q') of
+    epoch seconds, so unbuilt rows take less room than built objects.
+    """
+
+    def __init__(self, cls: type, fields: List[str] = (),
+                 columns: list = ()):
+        """ columns holds the values of each of fields, by row number
+        """
+        super().__init__()
+        self.cls = cls
+        self.fields = list(fields)
+        self.positions = {name: i for i, name in enumerate(self.fields)}
+        self.columns = list(columns)
+
+    def __getitem__(self, key: str):
+        """ Object of id key, built on first read
+        """
+        value = dict.__getitem__(self, key)
+        if type(value) is int:
+            value = self.cls(**self.row(value))
+            dict.__setitem__(self, key, value)
+        return value
+
+    def cell(self, position: int, row: int):
+        """ Value of column position at row, dates as datetimes
+        """
+        column = self.columns[position]
+        if type(column) is array:
+            return snapshot.EPOCH + timedelta(seconds=column[row])
+        return column[row]
+
+    def row(self, row: int) -> dict:
+        """ Serialized fields of row, dates as datetimes
+        """
+        return {name: self.cell(position, row)
+                for position, name in enumerate(self.fields)}
+
+    def build(self):
+        """ Build every object, one datetime per distinct date, then drop
+        the columns
+        """
+        self.columns = [snapshot.datetimes(column)
+                        if type(column) is array else column
+                        for column in self.columns]
+        for key in self:
+            self[key]
+        self.columns = []
+
+    def get(self, key: str, default=None):
+        """ Object of id key, or default
+        """
+        return self[key] if key in self else default
+
+    def values(self) -> list:
+        """ Every object, all built
+        """
+        return [self[key] for key in self]
+
+    def items(self) -> list:
+        """ Every (id, object) pair, all built
+        """
+        return [(key, self[key]) for key in self]
+
+    def attribute(self, key: str, name: str):
+        """ Attribute name of the object of id key, without building it
+        """
+        value = dict.__getitem__(self, key)
+        if type(value) is int:
+            position = self.positions.get(name)
+            return None if position is None else self.cell(position, value)
+        return getattr(value, name)
+
+    def serialized(self, key: str, format_dates: bool) -> dict:
+        """ to_json(True, format_dates) of the object of id key, without
+        building it unless its dates are still strings and datetimes
+        are asked for
+        """
+        value = dict.__getitem__(self, key)
+        if type(value) is int:
+            record = self.row(value)
+            if format_dates:
+                return {k: format_datetime(v) if type(v) is datetime else v
+                        for k, v in record.items()}
+            if all(type(record.get(name)) is datetime for name in DATES):
+                return record
+        return self[key].to_json(True, format_dates)
 
 
 class Base():
     """ Base class
+
+    STORAGE "file" rewrites .db_<Class>.json on every save and remove;
+    "journal" appends one line per save or remove to
+    .db_<Class>.journal and compacts it into the .json snapshot once it
+    grows past JOURNAL_MAX_SIZE bytes. A "file" write also drops the
+    journal, which load_from_file would otherwise replay over it.
+
+    INDEXES maps attribute names to True for a unique index, False
+    otherwise; INDEX[<Class>][attribute][value] holds the ids of the
+    objects with that value as of their last save, so search on those
+    attributes skips the scan but does not see unsaved changes.
+
+    Writes are grouped: they reach the files once BATCH_SIZE of them are
+    pending or BATCH_INTERVAL seconds after the first one, whichever
+    comes first, or on flush() and at exit. DURABILITY "fsync" also
+    forces each flush to disk instead of leaving it to the OS.
+
+    SNAPSHOT "binary" stores the snapshot in .db_<Class>.bin (see
+    models.snapshot) instead of .db_<Class>.json; whichever of the two
+    files exists is loaded, and converted on the next write.
+
+    LOAD "lazy" keeps the loaded snapshot in columns, created_at and
+    updated_at as epoch seconds, in DATA[<Class>] (a Records) and builds
+    each object when get, search or all first reaches it, instead of
+    building them all in load_from_file.
+
+    Attributes live in __slots__: a subclass declares its own, and
+    FIELDS lists those of the class and its bases, in that order, for
+    to_json. A subclass without __slots__ falls back to a __dict__.
     """
+    __slots__ = ('id', 'created_at', 'updated_at')
+    FIELDS = PUBLIC_FIELDS = __slots__
+    STORAGE = getenv("BASE_STORAGE", "file")
+    JOURNAL_MAX_SIZE = int(getenv("BASE_JOURNAL_MAX_SIZE", 1 << 20))
+    BATCH_SIZE = int(getenv("BASE_BATCH_SIZE", 1))
+    BATCH_INTERVAL = float(getenv("BASE_BATCH_INTERVAL", 0))
+    DURABILITY = getenv("BASE_DURABILITY", "os")
+    SNAPSHOT = getenv("BASE_SNAPSHOT", "json")
+    LOAD = getenv("BASE_LOAD", "eager")
+    INDEXES = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """ Collect FIELDS from the __slots__ of cls and its bases
+        """
+        super().__init_subclass__(**kwargs)
+        cls.FIELDS = tuple(name for klass in reversed(cls.__mro__)
+                           for name in klass.__dict__.get('__slots__', ()))
+        cls.PUBLIC_FIELDS = tuple(name for name in cls.FIELDS
+                                  if name[0] != '_')
 
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a Base instance
         """
         s_class = str(self.__class__.__name__)
         if DATA.get(s_class) is None:
-            DATA[s_class] = {}
+            DATA[s_class] = Records(self.__class__)
+            self.__class__.rebuild_indexes()
 
-        self.id = kwargs.get('id', str(uuid.uuid4()))
-        if kwargs.get('created_at') is not None:
-            self.created_at = datetime.strptime(kwargs.get('created_at'),
-                                                TIMESTAMP_FORMAT)
-        else:
-            self.created_at = datetime.utcnow()
-        if kwargs.get('updated_at') is not None:
-            self.updated_at = datetime.strptime(kwargs.get('updated_at'),
-                                                TIMESTAMP_FORMAT)
-        else:
-            self.updated_at = datetime.utcnow()
+        self.id = kwargs['id'] if 'id' in kwargs else str(uuid.uuid4())
+        self.created_at = self.to_datetime(kwargs.get('created_at'))
+        self.updated_at = self.to_datetime(kwargs.get('updated_at'))
+
+    @staticmethod
+    def to_datetime(value) -> datetime:
+        """ Parse a serialized timestamp; now if None, as is if datetime
+        """
+        if value is None:
+            return datetime.utcnow()
+        if type(value) is datetime:
+            return value
+        return datetime.strptime(value, TIMESTAMP_FORMAT)
 
     def __eq__(self, other: TypeVar('Base')) -> bool:
         """ Equality
@@ -44,62 +228,325 @@ class Base():
             return False
         return (self.id == other.id)
 
-    def to_json(self, for_serialization: bool = False) -> dict:
+    def to_json(self, for_serialization: bool = False,
+                format_dates: bool = True) -> dict:
         """ Convert the object a JSON dictionary
         """
         result = {}
-        for key, value in self.__dict__.items():
+        for key in self.FIELDS if for_serialization else self.PUBLIC_FIELDS:
+            try:
+                value = getattr(self, key)
+            except AttributeError:
+                continue
+            if format_dates and type(value) is datetime:
+                value = format_datetime(value)
+            result[key] = value
+        for key, value in getattr(self, '__dict__', {}).items():
             if not for_serialization and key[0] == '_':
                 continue
-            if type(value) is datetime:
-                result[key] = value.strftime(TIMESTAMP_FORMAT)
+            if format_dates and type(value) is datetime:
+                result[key] = format_datetime(value)
             else:
                 result[key] = value
         return result
 
+    @classmethod
+    def snapshot_paths(cls) -> List[str]:
+        """ Snapshot file of the configured format, then the other one
+        """
+        paths = [".db_{}.json".format(cls.__name__),
+                 ".db_{}.bin".format(cls.__name__)]
+        return paths[::-1] if cls.SNAPSHOT == "binary" else paths
+
     @classmethod
     def load_from_file(cls):
-        """ Load all objects from file
+        """ Load all objects from file, then replay the journal
         """
+        cls.flush()
         s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        DATA[s_class] = {}
-        if not path.exists(file_path):
-            return
+        file_path, other_path = cls.snapshot_paths()
+        if not path.exists(file_path) and path.exists(other_path):
+            file_path = other_path
+        fields, columns = [], []
+        if file_path.endswith(".bin") and path.exists(file_path):
+            with open(file_path, 'rb') as f:
+                fields, columns = snapshot.load_columns(f)
+        elif path.exists(file_path):
+            with open(file_path, 'r') as f:
+                objs_json = json.load(f)
+            for obj_json in objs_json.values():
+                fields.extend(k for k in obj_json if k not in fields)
+            columns = [[obj_json.get(k) for obj_json in objs_json.values()]
+                       for k in fields]
+            del objs_json
+            for position, name in enumerate(fields):
+                seconds = to_seconds(columns[position]) \
+                    if name in DATES else None
+                if seconds is not None:
+                    columns[position] = seconds
+        records = Records(cls, fields, columns)
+        DATA[s_class] = records
+        if 'id' in records.positions:
+            for row, obj_id in enumerate(columns[records.positions['id']]):
+                dict.__setitem__(records, obj_id, row)
+            if cls.LOAD != "lazy":
+                records.build()
+        cls.replay_journal()
+        cls.rebuild_indexes()
+        if file_path == other_path:
+            cls.compact()
 
-        with open(file_path, 'r') as f:
-            objs_json = json.load(f)
-            for obj_id, obj_json in objs_json.items():
-                DATA[s_class][obj_id] = cls(**obj_json)
+    @classmethod
+    def replay_journal(cls):
+        """ Apply the journal records on top of the loaded objects
+        """
+        s_class = cls.__name__
+        journal_path = ".db_{}.journal".format(s_class)
+        if not path.exists(journal_path):
+            return
+        with open(journal_path, 'rb+') as f:
+            good = 0
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError
+                    record = json.loads(line)
+                except ValueError:
+                    # torn last write: drop it so new records follow
+                    f.truncate(good)
+                    break
+                good += len(line)
+                if record.get('op') == 'remove':
+                    DATA[s_class].pop(record.get('id'), None)
+                else:
+                    obj = cls(**record.get('obj'))
+                    DATA[s_class][obj.id] = obj
 
     @classmethod
     def save_to_file(cls):
         """ Save all objects to file
         """
         s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        objs_json = {}
-        for obj_id, obj in DATA[s_class].items():
-            objs_json[obj_id] = obj.to_json(True)
+        file_path, other_path = cls.snapshot_paths()
+        tmp_path = "{}.tmp".format(file_path)
+        records = DATA[s_class]
+        if cls.SNAPSHOT == "binary":
+            with open(tmp_path, 'wb') as f:
+                snapshot.dump([records.serialized(obj_id, False)
+                               for obj_id in records], f)
+                cls.sync(f)
+        else:
+            objs_json = {}
+            for obj_id in records:
+                objs_json[obj_id] = records.serialized(obj_id, True)
+            with open(tmp_path, 'w') as f:
+                json.dump(objs_json, f)
+                cls.sync(f)
+        os.replace(tmp_path, file_path)
+        if path.exists(other_path):
+            os.remove(other_path)
+        cls.sync_directory(file_path)
 
-        with open(file_path, 'w') as f:
-            json.dump(objs_json, f)
+    @classmethod
+    def sync(cls, f):
+        """ Force f to disk if DURABILITY asks for it
+        """
+        if cls.DURABILITY == "fsync":
+            f.flush()
+            os.fsync(f.fileno())
+
+    @classmethod
+    def sync_directory(cls, file_path: str):
+        """ Force the entries of the directory of file_path to disk if
+        DURABILITY asks for it, so a rename or a new file survives too
+        """
+        if cls.DURABILITY != "fsync":
+            return
+        fd = os.open(path.dirname(path.abspath(file_path)), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @classmethod
+    def append_journal(cls, records: List[dict]):
+        """ Append records to the journal, compacting it when too big;
+        a failed append is cut off so it can be retried
+        """
+        journal_path = ".db_{}.journal".format(cls.__name__)
+        data = "".join(json.dumps(r) + "\n" for r in records).encode()
+        with open(journal_path, 'ab', buffering=0) as f:
+            start = f.seek(0, os.SEEK_END)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[f.write(view):]
+                cls.sync(f)
+            except BaseException:
+                f.truncate(start)
+                raise
+            size = f.tell()
+        if start == 0:
+            cls.sync_directory(journal_path)
+        if size > cls.JOURNAL_MAX_SIZE:
+            cls.compact()
+
+    @classmethod
+    def write(cls, record: dict = None):
+        """ Queue a change: a journal record, or None for a snapshot
+        """
+        with LOCK:
+            pending = PENDING.setdefault(cls, [])
+            pending.append(record)
+            if len(pending) >= cls.BATCH_SIZE:
+                cls.flush()
+            else:
+                cls.schedule_flush()
+
+    @classmethod
+    def schedule_flush(cls):
+        """ Start the BATCH_INTERVAL timer if none is running
+        """
+        with LOCK:
+            if cls.BATCH_INTERVAL > 0 and cls not in TIMERS:
+                timer = threading.Timer(cls.BATCH_INTERVAL,
+                                        cls.flush_in_background)
+                timer.daemon = True
+                TIMERS[cls] = timer
+                timer.start()
+
+    @classmethod
+    def flush_in_background(cls):
+        """ Flush from the timer: nobody waits for it, so log a failure
+        and try again after another BATCH_INTERVAL
+        """
+        try:
+            cls.flush()
+        except Exception:
+            logging.getLogger(__name__).exception(
+                "Flush of %s failed, retrying", cls.__name__)
+            cls.schedule_flush()
+
+    @classmethod
+    def flush(cls):
+        """ Write every pending change of the class at once; if that
+        fails, the changes stay pending for the next flush
+        """
+        with LOCK:
+            timer = TIMERS.pop(cls, None)
+            if timer is not None:
+                timer.cancel()
+            pending = PENDING.pop(cls, [])
+            if len(pending) == 0:
+                return
+            try:
+                if cls.STORAGE == "journal":
+                    cls.append_journal(pending)
+                else:
+                    cls.compact()
+            except BaseException:
+                PENDING[cls] = pending + PENDING.get(cls, [])
+                raise
+
+    @classmethod
+    def compact(cls):
+        """ Write a fresh snapshot and empty the journal
+        """
+        cls.save_to_file()
+        journal_path = ".db_{}.journal".format(cls.__name__)
+        if path.exists(journal_path):
+            os.remove(journal_path)
 
     def save(self):
         """ Save current object
         """
         s_class = self.__class__.__name__
-        self.updated_at = datetime.utcnow()
-        DATA[s_class][self.id] = self
-        self.__class__.save_to_file()
+        with LOCK:
+            self.check_unique()
+            self.updated_at = datetime.utcnow()
+            DATA[s_class][self.id] = self
+            self.index()
+            if self.STORAGE == "journal":
+                self.__class__.write({'op': 'save',
+                                      'obj': self.to_json(True)})
+            else:
+                self.__class__.write()
 
     def remove(self):
         """ Remove object
         """
         s_class = self.__class__.__name__
-        if DATA[s_class].get(self.id) is not None:
-            del DATA[s_class][self.id]
-            self.__class__.save_to_file()
+        with LOCK:
+            if DATA[s_class].get(self.id) is not None:
+                del DATA[s_class][self.id]
+                self.unindex()
+                if self.STORAGE == "journal":
+                    self.__class__.write({'op': 'remove', 'id': self.id})
+                else:
+                    self.__class__.write()
+
+    @classmethod
+    def rebuild_indexes(cls):
+        """ Index every loaded object from scratch, built or not
+        """
+        s_class = cls.__name__
+        INDEX[s_class] = {attribute: {} for attribute in cls.INDEXES}
+        INDEXED[s_class] = {}
+        records = DATA.get(s_class, {})
+        for obj_id in records:
+            cls.index_id(obj_id, tuple(records.attribute(obj_id, attribute)
+                                       for attribute in cls.INDEXES))
+
+    def check_unique(self):
+        """ Raise ValueError if a unique attribute is already used; a
+        value the object was already indexed with passes, so duplicates
+        loaded from file can still be saved
+        """
+        s_class = self.__class__.__name__
+        indexed = INDEXED[s_class].get(self.id, ())
+        for position, (attribute, unique) in enumerate(self.INDEXES.items()):
+            value = getattr(self, attribute)
+            if not unique or value is None:
+                continue
+            if position < len(indexed) and indexed[position] == value:
+                continue
+            owners = INDEX[s_class][attribute].get(value, {})
+            if any(obj_id != self.id for obj_id in owners):
+                raise ValueError("{} already used".format(attribute))
+
+    def index(self):
+        """ Add current object to the indexes of its class
+        """
+        self.index_id(self.id, tuple(getattr(self, attribute)
+                                     for attribute in self.INDEXES))
+
+    def unindex(self):
+        """ Remove current object from the indexes of its class
+        """
+        self.unindex_id(self.id)
+
+    @classmethod
+    def index_id(cls, obj_id: str, values: tuple):
+        """ Index obj_id under the values of its indexed attributes,
+        in INDEXES order
+        """
+        s_class = cls.__name__
+        cls.unindex_id(obj_id)
+        for attribute, value in zip(cls.INDEXES, values):
+            INDEX[s_class][attribute].setdefault(value, {})[obj_id] = None
+        INDEXED[s_class][obj_id] = values
+
+    @classmethod
+    def unindex_id(cls, obj_id: str):
+        """ Remove obj_id from the indexes
+        """
+        s_class = cls.__name__
+        values = INDEXED[s_class].pop(obj_id, ())
+        for attribute, value in zip(cls.INDEXES, values):
+            owners = INDEX[s_class][attribute][value]
+            del owners[obj_id]
+            if not owners:
+                del INDEX[s_class][attribute][value]
 
     @classmethod
     def count(cls) -> int:
@@ -123,9 +570,13 @@ class Base():
 
     @classmethod
     def search(cls, attributes: dict = {}) -> List[TypeVar('Base')]:
-        """ Search all objects with matching attributes
+        """ Search all objects with matching attributes, through the
+        smallest index among the searched attributes if any; an indexed
+        attribute is matched as of the last save, so changes not saved
+        yet are missed where the scan used to find them
         """
         s_class = cls.__name__
+
         def _search(obj):
             if len(attributes) == 0:
                 return True
@@ -133,5 +584,26 @@ class Base():
                 if (getattr(obj, k) != v):
                     return False
             return True
-        
-        return list(filter(_search, DATA[s_class].values()))
+
+        records = DATA[s_class]
+        candidates = None
+        for k, v in attributes.items():
+            if k not in cls.INDEXES:
+                continue
+            try:
+                owners = INDEX[s_class][k].get(v, {})
+            except TypeError:
+                continue
+            if candidates is None or len(owners) < len(candidates):
+                candidates = owners
+        if candidates is None:
+            return list(filter(_search, records.values()))
+        return list(filter(_search, [records[i] for i in candidates]))
+
+
+@atexit.register
+def flush_all():
+    """ Flush the pending changes of every class
+    """
+    for cls in list(PENDING):
+        cls.flush()
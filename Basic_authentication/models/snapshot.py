@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+""" Snapshot module: struct-packed columnar file of serialized objects
+
+Layout: a header (magic, rows, columns) then, per column, its kind,
+name, a null mask of one byte per row and a length-prefixed payload:
+- "t": datetimes as signed 64-bit epoch seconds
+- "s": strings joined by NUL bytes, decoded with a single split
+- "j": any other values, as JSON texts joined by NUL bytes
+"""
+from array import array
+from datetime import datetime, timedelta
+from typing import BinaryIO, List, Tuple
+import json
+import struct
+
+
+MAGIC = b'BDB1'
+HEADER = struct.Struct('<4sII')
+COLUMN = struct.Struct('<cH')
+PAYLOAD = struct.Struct('<Q')
+EPOCH = datetime(1970, 1, 1)
+SECOND = timedelta(seconds=1)
+
+
+def column_kind(values: list) -> bytes:
+    """ Narrowest kind holding every non-None value
+    """
+    present = [v for v in values if v is not None]
+    if all(type(v) is datetime for v in present):
+        return b't'
+    if all(type(v) is str and '\0' not in v for v in present):
+        return b's'
+    return b'j'
+
+
+def dump(records: List[dict], f: BinaryIO):
+    """ Write records, dictionaries of attributes, to f
+    """
+    names = []
+    for record in records:
+        for name in record:
+            if name not in names:
+                names.append(name)
+    f.write(HEADER.pack(MAGIC, len(records), len(names)))
+    for name in names:
+        values = [record.get(name) for record in records]
+        kind = column_kind(values)
+        if kind == b't':
+            payload = array('q', [0 if v is None else (v - EPOCH) // SECOND
+                                  for v in values]).tobytes()
+        elif kind == b's':
+            payload = '\0'.join('' if v is None else v
+                                for v in values).encode()
+        else:
+            payload = '\0'.join(json.dumps(v) for v in values).encode()
+        encoded = name.encode()
+        f.write(COLUMN.pack(kind, len(encoded)))
+        f.write(encoded)
+        f.write(bytes(v is None for v in values))
+        f.write(PAYLOAD.pack(len(payload)))
+        f.write(payload)
+
+
+def load(f: BinaryIO) -> List[dict]:
+    """ Read back the records written by dump
+    """
+    names, rows = load_rows(f)
+    return [dict(zip(names, row)) for row in rows]
+
+
+def load_rows(f: BinaryIO) -> Tuple[List[str], List[tuple]]:
+    """ Column names, and the records written by dump as value tuples
+    """
+    names, columns = load_columns(f)
+    columns = [datetimes(c) if type(c) is array else c for c in columns]
+    return names, list(zip(*columns))
+
+
+def load_columns(f: BinaryIO) -> Tuple[List[str], list]:
+    """ Column names, and the values written by dump column by column;
+    a datetime column without None stays an array('q') of epoch seconds
+    """
+    data = memoryview(f.read())
+    magic, rows, n_columns = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a snapshot file")
+    offset = HEADER.size
+    names, columns = [], []
+    for _ in range(n_columns):
+        kind, length = COLUMN.unpack_from(data, offset)
+        offset += COLUMN.size
+        names.append(str(data[offset:offset + length], 'utf-8'))
+        offset += length
+        nulls = data[offset:offset + rows]
+        offset += rows
+        length, = PAYLOAD.unpack_from(data, offset)
+        offset += PAYLOAD.size
+        payload = data[offset:offset + length]
+        offset += length
+        if kind == b't':
+            seconds = array('q')
+            seconds.frombytes(payload)
+            if not any(nulls):
+                columns.append(seconds)
+                continue
+            values = datetimes(seconds)
+        elif rows == 0:
+            values = []
+        else:
+            values = str(payload, 'utf-8').split('\0')
+            if kind == b'j':
+                values = [json.loads(v) for v in values]
+        if any(nulls):
+            values = [None if null else v for v, null in zip(values, nulls)]
+        columns.append(values)
+    return names, columns
+
+
+def datetimes(seconds: array) -> List[datetime]:
+    """ Datetimes of epoch seconds, one object per distinct second
+    """
+    dates = {s: EPOCH + timedelta(seconds=s) for s in set(seconds)}
+    return [dates[s] for s in seconds]
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""Base storage test suite"""
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+from models import snapshot
+from models.base import DATA, PENDING, Base
+from models.user import User
+
+
+class StorageTestCase(unittest.TestCase):
+    """Run each test in an empty directory with default User settings"""
+
+    SETTINGS = ("STORAGE", "JOURNAL_MAX_SIZE", "BATCH_SIZE",
+                "BATCH_INTERVAL", "DURABILITY", "SNAPSHOT", "LOAD")
+
+    def setUp(self):
+        """Move to a fresh directory and start from no users."""
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.settings = {name: getattr(User, name)
+                         for name in self.SETTINGS}
+        for name in self.SETTINGS:
+            setattr(User, name, getattr(Base, name))
+        User.load_from_file()
+
+    def tearDown(self):
+        """Restore the settings and the working directory."""
+        User.flush()
+        for name, value in self.settings.items():
+            setattr(User, name, value)
+        DATA.pop('User', None)
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def reload(self) -> dict:
+        """Reload users from disk, as {id: to_json(True)}."""
+        User.load_from_file()
+        return {obj_id: user.to_json(True)
+                for obj_id, user in DATA['User'].items()}
+
+    def snapshot(self) -> dict:
+        """Users currently in memory, as {id: to_json(True)}."""
+        return {obj_id: user.to_json(True)
+                for obj_id, user in DATA['User'].items()}
+
+
+class TestJournal(StorageTestCase):
+    """Test suite for the journal storage"""
+
+    def setUp(self):
+        """Use the journal storage."""
+        super().setUp()
+        User.STORAGE = "journal"
+
+    def test_replay(self):
+        """Saves, updates and removes are replayed on load."""
+        users = [User(email="u{}@x".format(i)) for i in range(3)]
+        for user in users:
+            user.save()
+        users[0].first_name = "Ann"
+        users[0].save()
+        users[1].remove()
+        expected = self.snapshot()
+
+        self.assertTrue(os.path.exists(".db_User.journal"))
+        self.assertFalse(os.path.exists(".db_User.json"))
+        self.assertEqual(self.reload(), expected)
+        self.assertEqual(User.get(users[0].id).first_name, "Ann")
+        self.assertIsNone(User.get(users[1].id))
+
+    def test_torn_tail(self):
+        """A partial last record is dropped and later ones are kept."""
+        User(email="a@x").save()
+        with open(".db_User.journal", "a") as f:
+            f.write('{"op": "save", "obj": {"id"')
+        self.assertEqual(len(self.reload()), 1)
+
+        late = User(email="late@x")
+        late.save()
+        with open(".db_User.journal") as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual(len(self.reload()), 2)
+        self.assertIsNotNone(User.get(late.id))
+
+    def test_compaction(self):
+        """Crossing JOURNAL_MAX_SIZE folds the journal into the snapshot."""
+        User.JOURNAL_MAX_SIZE = 1000
+        for i in range(20):
+            User(email="u{}@x".format(i)).save()
+        expected = self.snapshot()
+
+        self.assertTrue(os.path.exists(".db_User.json"))
+        self.assertLess(os.path.getsize(".db_User.journal")
+                        if os.path.exists(".db_User.journal") else 0, 1000)
+        self.assertEqual(self.reload(), expected)
+
+    def test_switch_to_file(self):
+        """A file write drops the journal instead of replaying it."""
+        user = User(email="a@x", first_name="J")
+        user.save()
+        other = User(email="b@x")
+        other.save()
+
+        User.STORAGE = "file"
+        user.first_name = "F"
+        user.save()
+        other.remove()
+
+        self.assertFalse(os.path.exists(".db_User.journal"))
+        users = self.reload()
+        self.assertEqual(users[user.id]["first_name"], "F")
+        self.assertNotIn(other.id, users)
+
+
+class TestIndex(StorageTestCase):
+    """Test suite for the indexes of Base.search"""
+
+    def test_unique(self):
+        """A new user cannot take an email already saved."""
+        User(email="a@x").save()
+        with self.assertRaises(ValueError):
+            User(email="a@x").save()
+        other = User(email="b@x")
+        other.save()
+        other.email = "a@x"
+        with self.assertRaises(ValueError):
+            other.save()
+
+    def test_loaded_duplicates(self):
+        """Users sharing an email in the file can still be saved."""
+        first, second = User(email="a@x"), User(email="a@x")
+        with open(".db_User.json", "w") as f:
+            json.dump({user.id: user.to_json(True)
+                       for user in (first, second)}, f)
+        User.load_from_file()
+        self.assertEqual(len(User.search({"email": "a@x"})), 2)
+        for user in User.search({"email": "a@x"}):
+            user.first_name = "Renamed"
+            user.save()
+        self.assertEqual(len(User.search({"first_name": "Renamed"})), 2)
+
+    def test_search_follows_saves(self):
+        """Indexed search sees an email change once it is saved."""
+        user = User(email="a@x")
+        user.save()
+        user.email = "b@x"
+        self.assertEqual(User.search({"email": "b@x"}), [])
+        user.save()
+        self.assertEqual(User.search({"email": "a@x"}), [])
+        self.assertEqual(User.search({"email": "b@x"}), [user])
+
+
+class TestBatching(StorageTestCase):
+    """Test suite for grouped writes"""
+
+    def setUp(self):
+        """Queue journal writes until flushed."""
+        super().setUp()
+        User.STORAGE = "journal"
+        User.BATCH_SIZE = 100
+
+    def test_failed_flush_stays_pending(self):
+        """Changes a flush could not write are written by the next one."""
+        users = [User(email="u{}@x".format(i)) for i in range(2)]
+        os.mkdir(".db_User.journal")
+        for user in users:
+            user.save()
+        with self.assertRaises(OSError):
+            User.flush()
+        self.assertEqual(len(PENDING[User]), 2)
+
+        os.rmdir(".db_User.journal")
+        User.flush()
+        self.assertNotIn(User, PENDING)
+        self.assertEqual(set(self.reload()), {user.id for user in users})
+
+    def test_background_retry(self):
+        """A failed timer flush is logged and retried."""
+        User.BATCH_INTERVAL = 0.05
+        os.mkdir(".db_User.journal")
+        user = User(email="a@x")
+        with self.assertLogs("models.base", "ERROR"):
+            user.save()
+            time.sleep(0.2)
+        os.rmdir(".db_User.journal")
+        time.sleep(0.2)
+        self.assertNotIn(User, PENDING)
+        self.assertIn(user.id, self.reload())
+
+    def test_fsync_directory(self):
+        """fsync durability also syncs the directory of a new file."""
+        User.DURABILITY = "fsync"
+        User.STORAGE = "file"
+        with mock.patch("models.base.os.fsync", wraps=os.fsync) as fsync:
+            User(email="a@x").save()
+            User.flush()
+        self.assertEqual(fsync.call_count, 2)
+
+
+class TestSnapshot(StorageTestCase):
+    """Test suite for the binary snapshot"""
+
+    def test_round_trip(self):
+        """dump then load_rows gives back every column and value."""
+        records = [
+            {"id": "1", "at": datetime(2024, 1, 2, 3, 4, 5), "none": None,
+             "mixed": 1, "text": "a\0b", "name": "Ann"},
+            {"id": "2", "at": None, "none": None,
+             "mixed": "one", "text": "", "name": None},
+            {"id": "3", "at": datetime(1969, 12, 31, 23, 59, 59),
+             "mixed": [1, {"a": None}], "text": "\0", "extra": True},
+        ]
+        f = io.BytesIO()
+        snapshot.dump(records, f)
+        f.seek(0)
+        names, rows = snapshot.load_rows(f)
+        self.assertEqual(names, ["id", "at", "none", "mixed", "text",
+                                 "name", "extra"])
+        self.assertEqual([dict(zip(names, row)) for row in rows],
+                         [{name: record.get(name) for name in names}
+                          for record in records])
+
+        f = io.BytesIO()
+        snapshot.dump([], f)
+        f.seek(0)
+        self.assertEqual(snapshot.load_rows(f), ([], []))
+        with self.assertRaises(ValueError):
+            snapshot.load_rows(io.BytesIO(b"{}" * 8))
+
+    def test_migration(self):
+        """The snapshot is converted to the configured format on load."""
+        for i in range(3):
+            User(email="u{}@x".format(i), first_name="\0").save()
+        expected = self.snapshot()
+
+        User.SNAPSHOT = "binary"
+        self.assertEqual(self.reload(), expected)
+        self.assertTrue(os.path.exists(".db_User.bin"))
+        self.assertFalse(os.path.exists(".db_User.json"))
+        self.assertEqual(self.reload(), expected)
+
+        User.SNAPSHOT = "json"
+        self.assertEqual(self.reload(), expected)
+        self.assertTrue(os.path.exists(".db_User.json"))
+        self.assertFalse(os.path.exists(".db_User.bin"))
+
+    def test_journal(self):
+        """The journal is replayed over a binary snapshot."""
+        User.SNAPSHOT = "binary"
+        User.STORAGE = "journal"
+        User.JOURNAL_MAX_SIZE = 1000
+        users = [User(email="u{}@x".format(i)) for i in range(10)]
+        for user in users:
+            user.save()
+        self.assertTrue(os.path.exists(".db_User.bin"))
+        users[0].first_name = "Ann"
+        users[0].save()
+        users[1].remove()
+        self.assertTrue(os.path.exists(".db_User.journal"))
+        expected = self.snapshot()
+
+        self.assertEqual(self.reload(), expected)
+        self.assertEqual(User.get(users[0].id).first_name, "Ann")
+        self.assertIsNone(User.get(users[1].id))
+
+
+class TestLazy(StorageTestCase):
+    """Test suite for lazy loading"""
+
+    def setUp(self):
+        """Save users, then load them back lazily."""
+        super().setUp()
+        for i in range(6):
+            user = User(email="u{}@x".format(i), first_name=str(i % 2))
+            user.password = "pwd"
+            user.save()
+        self.expected = self.snapshot()
+        User.LOAD = "lazy"
+        User.load_from_file()
+
+    def built(self) -> set:
+        """Ids of the users already built."""
+        records = DATA['User']
+        return {obj_id for obj_id in records
+                if type(dict.__getitem__(records, obj_id)) is not int}
+
+    def test_on_demand(self):
+        """get, search and all build users as they reach them."""
+        first, second = list(self.expected)[:2]
+        self.assertEqual(self.built(), set())
+        self.assertEqual(User.count(), 6)
+
+        self.assertEqual(User.get(first).to_json(True), self.expected[first])
+        self.assertEqual(self.built(), {first})
+        users = User.search({"email": self.expected[second]["email"]})
+        self.assertEqual([user.id for user in users], [second])
+        self.assertEqual(self.built(), {first, second})
+
+        users = User.search({"first_name": "1"})
+        self.assertEqual([user.to_json(True) for user in users],
+                         [user for user in self.expected.values()
+                          if user["first_name"] == "1"])
+        self.assertEqual(self.built(), set(self.expected))
+        self.assertEqual([user.to_json(True) for user in User.all()],
+                         list(self.expected.values()))
+
+    def test_save_unbuilt(self):
+        """Unbuilt users are written as eager loading would write them."""
+        for name in ("json", "bin"):
+            User.SNAPSHOT = "binary" if name == "bin" else "json"
+            User.LOAD = "eager"
+            User.load_from_file()
+            User.save_to_file()
+            with open(".db_User." + name, "rb") as f:
+                eager = f.read()
+
+            User.LOAD = "lazy"
+            User.load_from_file()
+            User.save_to_file()
+            self.assertEqual(self.built(), set())
+            with open(".db_User." + name, "rb") as f:
+                self.assertEqual(f.read(), eager)
+
+    def test_unparsed_dates(self):
+        """Dates not in the canonical format are parsed when built."""
+        with open(".db_User.json", "w") as f:
+            json.dump({"1": {"id": "1", "created_at": "2024-1-2T3:4:5",
+                             "updated_at": None}}, f)
+        User.load_from_file()
+        self.assertEqual(User.get("1").created_at,
+                         datetime(2024, 1, 2, 3, 4, 5))
+
+
+class TestUser(StorageTestCase):
+    """Test suite for the slotted User"""
+
+    def test_to_json(self):
+        """to_json keeps the attribute order and hides _password."""
+        user = User(email="a@x", first_name="Ann", last_name="Lee")
+        user.password = "secret"
+        self.assertFalse(hasattr(user, "__dict__"))
+        self.assertEqual(list(user.to_json()),
+                         ["id", "created_at", "updated_at", "email",
+                          "first_name", "last_name"])
+        serialized = user.to_json(True)
+        self.assertEqual(list(serialized),
+                         ["id", "created_at", "updated_at", "email",
+                          "_password", "first_name", "last_name"])
+        self.assertEqual(serialized["_password"], user.password)
+        self.assertEqual(serialized["created_at"],
+                         user.created_at.strftime("%Y-%m-%dT%H:%M:%S"))
+        self.assertTrue(User(**serialized).is_valid_password("secret"))
+
+
+if __name__ == "__main__":
+    unittest.main()
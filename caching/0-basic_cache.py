@@ -2,26 +2,40 @@
 """
 Basic dictionary
 """
-BaseCaching = __import__('base_caching').BaseCaching
+PolicyCaching = __import__('policy_caching').PolicyCaching
+tracked = __import__('policy_caching').tracked
 
 
-class BasicCache(BaseCaching):
+class BasicCache(PolicyCaching):
     """
-    BasicCache
+    BasicCache: no limit unless max_items or max_bytes is given, and then
+    new keys are refused once full since nothing is ever evicted
     """
 
-    def put(self, key, item):
+    def __init__(self, max_items=None, **kwargs):
+        """
+        unbounded by default
+        """
+        super().__init__(max_items, **kwargs)
+        self.max_items = max_items
+
+    @tracked
+    def put(self, key, item, ttl=None):
         """
         assign to the dictionary
         """
         if (key is not None and item is not None):
-            self.cache_data[key] = item
+            size = self._size(item)
+            if self._make_room(key, size):
+                self._store(key, item, size, ttl)
 
+    @tracked
     def get(self, key):
         """
         return the value linked to key
         """
-        if key is None or key not in self.cache_data.keys():
+        if (key is None or key not in self.cache_data.keys() or
+                self._expired(key)):
             return None
         else:
             return self.cache_data[key]
@@ -2,40 +2,49 @@
 """
 FIFO caching
 """
+from collections import OrderedDict
 
 
-BaseCaching = __import__('base_caching').BaseCaching
+PolicyCaching = __import__('policy_caching').PolicyCaching
+tracked = __import__('policy_caching').tracked
 
 
-class FIFOCache(BaseCaching):
+class FIFOCache(PolicyCaching):
     """
     FIFO Cache class
     """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """
-        overload
+        overload: keep insertion order so the oldest key pops in O(1)
         """
-        super().__init__()
+        super().__init__(*args, **kwargs)
+        self.cache_data = OrderedDict()
 
-    def put(self, key, item):
+    def _victim(self, key):
+        """
+        oldest key other than key
+        """
+        for k in self.cache_data:
+            if k != key:
+                return k
+        return None
+
+    @tracked
+    def put(self, key, item, ttl=None):
         """
         dictionary
         """
         if key and item:
-            self.cache_data.update({key: item})
-            if len(self.cache_data) > BaseCaching.MAX_ITEMS:
-                for k, v in self.cache_data.items():
-                    print('DISCARD:', list(self.cache_data.keys())[0])
-                    break
-                self.cache_data.pop(k)
-            else:
-                pass
+            size = self._size(item)
+            if self._make_room(key, size):
+                self._store(key, item, size, ttl)
 
+    @tracked
     def get(self, key):
         """
         get key
         """
-        if key is None:
+        if key is None or self._expired(key):
             return None
         return self.cache_data.get(key)
@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+"""
+LFU Caching
+"""
+from collections import OrderedDict
+from policy_caching import PolicyCaching, tracked
+
+
+class LFUCache(PolicyCaching):
+    """
+    Class that inherits from BaseCaching and is a caching system
+    discarding the least frequently used item, LRU order breaking ties
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.freq = {}
+        self.buckets = {}
+        self.head = 0
+        self.higher, self.lower = {}, {}
+        self.handle(self.head, None)
+
+    def handle(self, low, high):
+        """
+        link two frequency buckets
+        """
+        self.higher[low] = high
+        if high is not None:
+            self.lower[high] = low
+
+    def _bucket(self, count, after):
+        """
+        bucket of count, created right after the bucket of after
+        """
+        if count not in self.buckets:
+            self.buckets[count] = OrderedDict()
+            self.handle(count, self.higher[after])
+            self.handle(after, count)
+        return self.buckets[count]
+
+    def _unbucket(self, key):
+        """
+        take key out of its bucket, drop the bucket when it empties
+        """
+        count = self.freq.pop(key)
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            self.handle(self.lower.pop(count), self.higher.pop(count))
+            del self.buckets[count]
+        return count
+
+    def _touch(self, key):
+        """
+        move key from its frequency bucket to the next one
+        """
+        count = self.freq[key]
+        self._bucket(count + 1, count)[key] = None
+        self._unbucket(key)
+        self.freq[key] = count + 1
+
+    def _remove(self, key):
+        """
+        remove element
+        """
+        self._unbucket(key)
+        self._forget(key)
+
+    def _victim(self, key):
+        """
+        least recently used key of the lowest frequency
+        """
+        count = self.higher[self.head]
+        while count is not None:
+            for k in self.buckets[count]:
+                if k != key:
+                    return k
+            count = self.higher[count]
+        return None
+
+    @tracked
+    def put(self, key, item, ttl=None):
+        """
+        dictionary
+        """
+        if key is None or item is None:
+            return
+        size = self._size(item)
+        if key in self.cache_data:
+            self._touch(key)
+            if self._make_room(key, size):
+                self._store(key, item, size, ttl)
+            else:
+                self._remove(key)
+            return
+        if self._make_room(key, size):
+            self._store(key, item, size, ttl)
+            self._bucket(1, self.head)[key] = None
+            self.freq[key] = 1
+
+    @tracked
+    def get(self, key):
+        """
+        Return the value linked
+        """
+        if (key is None or key not in self.cache_data or
+                self._expired(key)):
+            return None
+        self._touch(key)
+        return self.cache_data[key]
@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""
+Thread-safe and sharded caching
+"""
+import threading
+from base_caching import BaseCaching
+
+
+class ThreadSafeCache(BaseCaching):
+    """
+    Wrap any caching policy so put and get run under one lock
+    """
+
+    def __init__(self, cache):
+        """
+        cache: the policy instance to protect, e.g. LRUCache()
+        """
+        self.cache = cache
+        self.lock = threading.RLock()
+
+    @property
+    def cache_data(self):
+        """
+        data of the wrapped policy
+        """
+        return self.cache.cache_data
+
+    def put(self, key, item, ttl=None):
+        """
+        dictionary
+        """
+        with self.lock:
+            self.cache.put(key, item, ttl)
+
+    def get(self, key):
+        """
+        Return the value linked
+        """
+        with self.lock:
+            return self.cache.get(key)
+
+    def sweep(self, limit=None):
+        """
+        remove expired entries of the wrapped policy
+        """
+        with self.lock:
+            return self.cache.sweep(limit)
+
+    def stats(self):
+        """
+        counters of the wrapped policy
+        """
+        with self.lock:
+            return self.cache.stats()
+
+    def start_sweeper(self, interval=1.0, limit=20):
+        """
+        sweep at most limit deadlines every interval seconds from a
+        daemon thread; set the returned event to stop it
+        """
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                self.sweep(limit)
+        threading.Thread(target=run, daemon=True).start()
+        return stop
+
+
+class ShardedCache(BaseCaching):
+    """
+    Spread keys over independently locked policies by hash
+    """
+
+    def __init__(self, factory, shards=8):
+        """
+        factory: callable returning a new policy for each shard,
+        e.g. lambda: LRUCache(max_items=1024)
+        """
+        self.shards = [ThreadSafeCache(factory()) for _ in range(shards)]
+
+    def shard(self, key):
+        """
+        shard responsible for key
+        """
+        return self.shards[hash(key) % len(self.shards)]
+
+    @property
+    def cache_data(self):
+        """
+        snapshot of every shard's data
+        """
+        data = {}
+        for shard in self.shards:
+            with shard.lock:
+                data.update(shard.cache_data)
+        return data
+
+    def put(self, key, item, ttl=None):
+        """
+        dictionary
+        """
+        if key is None:
+            return
+        self.shard(key).put(key, item, ttl)
+
+    def get(self, key):
+        """
+        Return the value linked
+        """
+        if key is None:
+            return None
+        return self.shard(key).get(key)
+
+    def sweep(self, limit=None):
+        """
+        remove expired entries, at most limit deadlines per shard
+        """
+        return sum(shard.sweep(limit) for shard in self.shards)
+
+    def stats(self):
+        """
+        counters summed over every shard
+        """
+        total = {}
+        for shard in self.shards:
+            for name, value in shard.stats().items():
+                if name == 'latency':
+                    latency = total.setdefault(name, {})
+                    for op, hist in value.items():
+                        merged = latency.setdefault(op, {})
+                        for bound, n in hist.items():
+                            merged[bound] = merged.get(bound, 0) + n
+                elif name != 'hit_ratio':
+                    total[name] = total.get(name, 0) + value
+        lookups = total['hits'] + total['misses']
+        total['hit_ratio'] = total['hits'] / lookups if lookups else 0.0
+        return total
+
+    def start_sweeper(self, interval=1.0, limit=20):
+        """
+        background sweep of every shard, set the returned event to stop
+        """
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                self.sweep(limit)
+        threading.Thread(target=run, daemon=True).start()
+        return stop
@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""
+LRU Caching on preallocated slot arrays
+"""
+from array import array
+from collections.abc import MutableMapping
+from policy_caching import PolicyCaching, tracked
+
+
+class SlotData(MutableMapping):
+    """
+    cache_data of a SlotLRUCache: key -> item through the key -> slot
+    dict, the only per-key dict of the cache; storing a new key takes a
+    slot and links it as the most recently used, deleting a key gives
+    its slot back
+    """
+
+    def __init__(self, cache):
+        """
+        view over cache
+        """
+        self.cache = cache
+
+    def __getitem__(self, key):
+        """
+        item of key
+        """
+        return self.cache.items[self.cache.slot[key]]
+
+    def __setitem__(self, key, item):
+        """
+        store item, taking a slot for a new key
+        """
+        cache = self.cache
+        slot = cache.slot.get(key)
+        if slot is None:
+            slot, cache.free = cache.free, cache.next[cache.free]
+            cache.keys[slot], cache.slot[key] = key, slot
+            cache._link(slot)
+        cache.items[slot] = item
+
+    def __delitem__(self, key):
+        """
+        drop key and free its slot
+        """
+        cache = self.cache
+        slot = cache.slot.pop(key)
+        cache._unlink(slot)
+        cache.keys[slot] = cache.items[slot] = None
+        cache.next[slot], cache.free = cache.free, slot
+
+    def __contains__(self, key):
+        """
+        True if key is stored
+        """
+        return key in self.cache.slot
+
+    def __iter__(self):
+        """
+        stored keys
+        """
+        return iter(self.cache.slot)
+
+    def __len__(self):
+        """
+        number of stored keys
+        """
+        return len(self.cache.slot)
+
+
+class SlotLRUCache(PolicyCaching):
+    """
+    LRUCache keeping its linked list in two array('l') of slot indices
+    and its keys and items in two lists indexed by slot, so the only
+    dict per key is key -> slot; slot 0 is the list sentinel and unused
+    slots are chained in a free list through `next`
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        slots = self.max_items + 1
+        self.next = array('l', range(1, slots + 1))
+        self.next[0], self.next[-1] = 0, 0
+        self.prev = array('l', bytes(self.next.itemsize * slots))
+        self.keys = [None] * slots
+        self.items = [None] * slots
+        self.slot = {}
+        self.free = 1 if slots > 1 else 0
+        self.cache_data = SlotData(self)
+
+    def _unlink(self, slot):
+        """
+        take slot out of the list
+        """
+        before, after = self.prev[slot], self.next[slot]
+        self.next[before], self.prev[after] = after, before
+
+    def _link(self, slot):
+        """
+        append slot as the most recently used
+        """
+        last = self.prev[0]
+        self.next[last], self.prev[slot] = slot, last
+        self.next[slot], self.prev[0] = 0, slot
+
+    def _victim(self, key):
+        """
+        least recently used key
+        """
+        return self.keys[self.next[0]]
+
+    @tracked
+    def put(self, key, item, ttl=None):
+        """
+        dictionary
+        """
+        if key and item:
+            if key in self.slot:
+                self._remove(key)
+            size = self._size(item)
+            if self._make_room(key, size):
+                self._store(key, item, size, ttl)
+
+    @tracked
+    def get(self, key):
+        """
+        Return the value linked
+        """
+        if (key is None or self.items[self.slot.get(key, 0)] is None or
+                self._expired(key)):
+            return None
+        slot = self.slot[key]
+        self._unlink(slot)
+        self._link(slot)
+        return self.items[slot]
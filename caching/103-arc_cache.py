@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+"""
+ARC Caching
+"""
+from collections import OrderedDict
+from policy_caching import PolicyCaching, tracked
+
+
+class ARCCache(PolicyCaching):
+    """
+    Adaptive Replacement Cache (Megiddo & Modha): keys seen once live in
+    t1, keys seen again in t2, and the ghost lists b1/b2 remember keys
+    recently evicted from each. A hit in a ghost list moves the target
+    size p of t1, so one-off scans cannot flush the frequent keys.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.t1, self.t2 = OrderedDict(), OrderedDict()
+        self.b1, self.b2 = OrderedDict(), OrderedDict()
+        self.p = 0
+
+    def _remove(self, key):
+        """
+        remove element without remembering it
+        """
+        if key in self.t1:
+            del self.t1[key]
+        else:
+            del self.t2[key]
+        self._forget(key)
+
+    def _discard(self, key):
+        """
+        evict element into the ghost list matching its resident list
+        """
+        ghost = self.b1 if key in self.t1 else self.b2
+        super()._discard(key)
+        ghost[key] = None
+
+    @staticmethod
+    def _lru(keys, key):
+        """
+        least recently used of keys other than key
+        """
+        for k in keys:
+            if k != key:
+                return k
+        return None
+
+    def _victim(self, key):
+        """
+        LRU of t1 while t1 is over its target size p, else LRU of t2
+        """
+        t1, t2 = self._lru(self.t1, key), self._lru(self.t2, key)
+        if t1 is not None and (t2 is None or len(self.t1) > self.p or
+                               (key in self.b2 and len(self.t1) == self.p)):
+            return t1
+        return t2
+
+    def _adapt(self, key):
+        """
+        move p on a ghost hit, trim the ghost lists on a full miss
+        """
+        c = self.max_items
+        if key in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) // len(self.b1), 1))
+        elif key in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+        elif len(self.t1) + len(self.b1) >= c:
+            if len(self.t1) < c and self.b1:
+                self.b1.popitem(last=False)
+            elif self.t1:
+                super()._discard(next(iter(self.t1)))
+        elif (len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >=
+              2 * c and self.b2):
+            self.b2.popitem(last=False)
+
+    @tracked
+    def put(self, key, item, ttl=None):
+        """
+        dictionary
+        """
+        if key is None or item is None:
+            return
+        if key in self.cache_data:
+            self._remove(key)
+            seen = True
+        else:
+            self._adapt(key)
+            seen = key in self.b1 or key in self.b2
+        size = self._size(item)
+        if self._make_room(key, size):
+            self._store(key, item, size, ttl)
+            (self.t2 if seen else self.t1)[key] = None
+        self.b1.pop(key, None)
+        self.b2.pop(key, None)
+
+    @tracked
+    def get(self, key):
+        """
+        Return the value linked
+        """
+        if (key is None or key not in self.cache_data or
+                self._expired(key)):
+            return None
+        self.t1.pop(key, None)
+        self.t2[key] = None
+        self.t2.move_to_end(key)
+        return self.cache_data[key]
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+"""
+Memoization backed by the caching policies
+"""
+import inspect
+import threading
+import weakref
+from concurrent.futures import Future
+from functools import wraps
+
+
+def memoize(policy, per_instance=False):
+    """
+    Cache the results of the decorated function in a caching policy.
+
+    policy is a BaseCaching instance, or a callable returning one (such
+    as LRUCache or lambda: LFUCache(max_items=128)). With per_instance
+    the decorated method gets one cache per object, built from policy,
+    which must then be callable; the decorator holds these caches and
+    drops each one with its object, so objects only need to support
+    weak references (with __slots__, list '__weakref__'). Positional
+    and keyword spellings of the same call share one entry; calls with
+    unhashable arguments are not cached. Concurrent calls for a key
+    being computed wait for that one computation instead of running
+    their own.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        caches = {}
+        if per_instance:
+            shared = None
+        elif callable(policy):
+            shared = policy()
+        else:
+            shared = policy
+        lock = threading.Lock()
+        flights = {}
+
+        def cache_of(args):
+            """
+            cache used for a call with args
+            """
+            if not per_instance:
+                return shared
+            owner = args[0]
+            cache = caches.get(id(owner))
+            if cache is None:
+                with lock:
+                    cache = caches.get(id(owner))
+                    if cache is None:
+                        weakref.finalize(owner, caches.pop, id(owner), None)
+                        cache = caches[id(owner)] = policy()
+            return cache
+
+        def make_key(args, kwargs):
+            """
+            hashable key for the call, None if an argument is unhashable
+            """
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = []
+            for name, value in bound.arguments.items():
+                kind = signature.parameters[name].kind
+                if kind is inspect.Parameter.VAR_KEYWORD:
+                    value = tuple(sorted(value.items()))
+                arguments.append((name, value))
+            if per_instance:
+                arguments = arguments[1:]
+            key = (func.__qualname__,) + tuple(arguments)
+            try:
+                hash(key)
+            except TypeError:
+                return None
+            return key
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            if key is None:
+                return func(*args, **kwargs)
+            cache = cache_of(args)
+            flight_key = (id(cache), key)
+            with lock:
+                hit = cache.get(key)
+                if hit is not None:
+                    return hit[0]
+                flight = flights.get(flight_key)
+                leader = flight is None
+                if leader:
+                    flight = flights[flight_key] = Future()
+            if not leader:
+                return flight.result()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                with lock:
+                    del flights[flight_key]
+                flight.set_exception(e)
+                raise
+            with lock:
+                cache.put(key, (result,))
+                del flights[flight_key]
+            flight.set_result(result)
+            return result
+
+        if not per_instance:
+            wrapper.cache = shared
+        return wrapper
+    return decorator
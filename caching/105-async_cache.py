@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""
+Asyncio caching in front of coroutine loaders
+"""
+import asyncio
+
+
+class AsyncCache():
+    """
+    Cache the results of a coroutine loader in a caching policy.
+
+    Concurrent awaits of a missing key share one pending load. A waiter
+    being cancelled does not cancel the load for the others, and a load
+    that fails or is cancelled leaves nothing in the cache. Keys are
+    stored as (key,), so policies refusing a falsy key still cache 0
+    or ''.
+    """
+
+    def __init__(self, policy, loader):
+        """
+        policy: BaseCaching instance holding the results, e.g. LRUCache()
+        loader: coroutine function called as await loader(key) on a miss
+        """
+        self.cache = policy
+        self.loader = loader
+        self.pending = {}
+
+    async def _load(self, key, ttl):
+        """
+        run the loader and store its result
+        """
+        try:
+            value = await self.loader(key)
+            self.cache.put((key,), (value,), ttl)
+            return value
+        finally:
+            del self.pending[key]
+
+    async def get(self, key, ttl=None):
+        """
+        Return the value linked, loading it on a miss
+        """
+        if key is None:
+            return None
+        hit = self.cache.get((key,))
+        if hit is not None:
+            return hit[0]
+        task = self.pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, ttl))
+            task.add_done_callback(
+                lambda done: done.cancelled() or done.exception())
+            self.pending[key] = task
+        return await asyncio.shield(task)
+
+    def put(self, key, value, ttl=None):
+        """
+        store value without calling the loader
+        """
+        if key is not None:
+            self.cache.put((key,), (value,), ttl)
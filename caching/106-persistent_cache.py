@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+"""
+Write-back persistence tier behind the caching policies
+"""
+import pickle
+import sqlite3
+from base_caching import BaseCaching
+
+
+class PersistentCache(BaseCaching):
+    """
+    Put a local sqlite file behind a caching policy.
+
+    Entries evicted from the policy are written to the file, checkpoint()
+    writes every resident entry, a miss in memory falls back to the file
+    and restore(n) reloads the n entries with the most hits, so a
+    restarted worker does not start cold.
+    """
+
+    def __init__(self, policy, path, batch=100):
+        """
+        policy: PolicyCaching instance kept in memory, e.g. LRUCache()
+        path: sqlite file; writes are committed every batch writes
+        """
+        self.cache = policy
+        self.batch = batch
+        self.writes = 0
+        self.hits = {}
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS entries ("
+                        "key BLOB PRIMARY KEY, value BLOB, hits INTEGER)")
+        self.chained = policy.on_evict
+        policy.on_evict = self._spill
+
+    @property
+    def cache_data(self):
+        """
+        data of the policy in memory
+        """
+        return self.cache.cache_data
+
+    def _write(self, key, item):
+        """
+        upsert one entry, commit every batch writes
+        """
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+            (pickle.dumps(key), pickle.dumps(item), self.hits.get(key, 0)))
+        self.writes += 1
+        if self.writes % self.batch == 0:
+            self.db.commit()
+
+    def _spill(self, key, item):
+        """
+        on_evict hook of the policy: write the evicted entry back
+        """
+        if self.chained is not None:
+            self.chained(key, item)
+        self._write(key, item)
+        self.hits.pop(key, None)
+
+    def put(self, key, item, ttl=None):
+        """
+        dictionary
+        """
+        self.cache.put(key, item, ttl)
+
+    def get(self, key):
+        """
+        Return the value linked, from memory or else from the file
+        """
+        item = self.cache.get(key)
+        if item is not None:
+            self.hits[key] = self.hits.get(key, 0) + 1
+            return item
+        if key is None:
+            return None
+        try:
+            blob = pickle.dumps(key)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None
+        row = self.db.execute("SELECT value, hits FROM entries WHERE key = ?",
+                              (blob,)).fetchone()
+        if row is None:
+            return None
+        item = pickle.loads(row[0])
+        self.hits[key] = row[1] + 1
+        self.cache.put(key, item)
+        return item
+
+    def checkpoint(self):
+        """
+        write every entry in memory to the file and commit
+        """
+        for key, item in list(self.cache.cache_data.items()):
+            self._write(key, item)
+        self.db.commit()
+
+    def restore(self, n=None):
+        """
+        load the n entries with the most hits from the file, hottest
+        last so recency-based policies keep them longest; return count
+        """
+        if n is None:
+            n = self.cache.max_items
+        rows = self.db.execute(
+            "SELECT key, value, hits FROM entries ORDER BY hits DESC "
+            "LIMIT ?", (-1 if n is None else n,)).fetchall()
+        for blob, value, hits in reversed(rows):
+            key = pickle.loads(blob)
+            self.hits[key] = hits
+            self.cache.put(key, pickle.loads(value))
+        return len(rows)
+
+    def close(self):
+        """
+        checkpoint and close the file
+        """
+        self.checkpoint()
+        self.db.close()
@@ -0,0 +1,182 @@
+#!/usr/bin/python3
+"""
+Trace-driven simulator: replay a key trace against every caching policy
+and report hit ratio, throughput and peak memory
+
+Usage: ./107-cache_simulator.py [--trace FILE | --generator zipf|scan|loop]
+           [--capacity N [N ...]] [--policy NAME [NAME ...]]
+           [--format table|json|csv]
+"""
+import argparse
+import csv
+import itertools
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+POLICIES = {
+    'BasicCache': __import__('0-basic_cache').BasicCache,
+    'FIFOCache': __import__('1-fifo_cache').FIFOCache,
+    'LIFOCache': __import__('2-lifo_cache').LIFOCache,
+    'LRUCache': __import__('3-lru_cache').LRUCache,
+    'MRUCache': __import__('4-mru_cache').MRUCache,
+    'LFUCache': __import__('100-lfu_cache').LFUCache,
+    'SlotLRUCache': __import__('102-slot_lru_cache').SlotLRUCache,
+    'ARCCache': __import__('103-arc_cache').ARCCache,
+}
+FIELDS = ['policy', 'capacity', 'requests', 'hit_ratio', 'ops_per_sec',
+          'peak_bytes']
+
+
+def zipf(length, keys, alpha=1.0, seed=0):
+    """
+    keys 1 to keys drawn with a 1/key**alpha weight (keys start at 1:
+    most policies refuse a falsy key such as 0)
+    """
+    rand = random.Random(seed)
+    weights = list(itertools.accumulate(
+        1 / rank ** alpha for rank in range(1, keys + 1)))
+    return rand.choices(range(1, keys + 1), cum_weights=weights, k=length)
+
+
+def scan(length, keys, alpha=1.0, seed=0, every=5000, width=None):
+    """
+    zipf trace with a scan over width never seen keys every `every`
+    requests
+    """
+    width = keys if width is None else width
+    trace, fresh = [], keys + 1
+    for i, key in enumerate(zipf(length, keys, alpha, seed)):
+        if i and i % every == 0:
+            trace.extend(range(fresh, fresh + width))
+            fresh += width
+        trace.append(key)
+    return trace[:length]
+
+
+def loop(length, keys, alpha=1.0, seed=0):
+    """
+    1, 2, ..., keys over and over
+    """
+    return [i % keys + 1 for i in range(length)]
+
+
+GENERATORS = {'zipf': zipf, 'scan': scan, 'loop': loop}
+
+
+def read_trace(path):
+    """
+    one key per line, blank lines skipped
+    """
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def refused(name, trace):
+    """
+    keys of trace that policy name does not cache
+    """
+    cls = POLICIES[name]
+    keys = []
+    for key in dict.fromkeys(trace):
+        cache = cls(max_items=1)
+        cache.put(key, True)
+        if cache.get(key) is None:
+            keys.append(key)
+    return keys
+
+
+def replay(cache, trace):
+    """
+    get every key, put it on a miss; return the number of hits
+    """
+    hits = 0
+    for key in trace:
+        if cache.get(key) is not None:
+            hits += 1
+        else:
+            cache.put(key, True)
+    return hits
+
+
+def simulate(name, capacity, trace):
+    """
+    result row of one policy at one capacity
+    """
+    cls = POLICIES[name]
+    start = time.perf_counter()
+    hits = replay(cls(max_items=capacity), trace)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    replay(cls(max_items=capacity), trace)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'policy': name,
+        'capacity': capacity,
+        'requests': len(trace),
+        'hit_ratio': round(hits / len(trace), 6) if trace else 0.0,
+        'ops_per_sec': round(len(trace) / elapsed) if elapsed else 0,
+        'peak_bytes': peak,
+    }
+
+
+def report(rows, fmt, out=sys.stdout):
+    """
+    write rows as an aligned table, JSON lines or CSV
+    """
+    if fmt == 'json':
+        for row in rows:
+            out.write(json.dumps(row) + "\n")
+    elif fmt == 'csv':
+        writer = csv.DictWriter(out, FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        out.write("{:<13} {:>9} {:>9} {:>12} {:>12}\n".format(
+            'policy', 'capacity', 'hit ratio', 'ops/sec', 'peak bytes'))
+        for row in rows:
+            out.write("{policy:<13} {capacity:>9} {hit_ratio:>9.4f} "
+                      "{ops_per_sec:>12} {peak_bytes:>12}\n".format(**row))
+
+
+def main(argv=None):
+    """
+    parse arguments, run every policy and capacity, print the report
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--trace', help="file with one key per line")
+    source.add_argument('--generator', choices=sorted(GENERATORS),
+                        default='zipf')
+    parser.add_argument('--length', type=int, default=100000)
+    parser.add_argument('--keys', type=int, default=10000)
+    parser.add_argument('--alpha', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--capacity', type=int, nargs='+',
+                        default=[100, 1000])
+    parser.add_argument('--policy', nargs='+', choices=sorted(POLICIES),
+                        default=sorted(POLICIES))
+    parser.add_argument('--format', choices=['table', 'json', 'csv'],
+                        default='table')
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        trace = read_trace(args.trace)
+    else:
+        trace = GENERATORS[args.generator](args.length, args.keys,
+                                           args.alpha, args.seed)
+    for name in args.policy:
+        keys = refused(name, trace)
+        if keys:
+            parser.error("{} does not cache the keys {!r}".format(
+                name, keys[:5]))
+    rows = [simulate(name, capacity, trace)
+            for capacity in args.capacity for name in args.policy]
+    report(rows, args.format)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,38 +2,48 @@
 """
 LIFO caching
 """
-BaseCaching = __import__('base_caching').BaseCaching
+from collections import OrderedDict
+PolicyCaching = __import__('policy_caching').PolicyCaching
+tracked = __import__('policy_caching').tracked
 
 
-class LIFOCache(BaseCaching):
+class LIFOCache(PolicyCaching):
     """
     LIFO Cache
     """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """
-        overload
+        overload: the last put key is always at the end of cache_data
         """
-        super().__init__()
+        super().__init__(*args, **kwargs)
+        self.cache_data = OrderedDict()
 
-    def put(self, key, item):
+    def _victim(self, key):
+        """
+        last put key other than key
+        """
+        for k in reversed(self.cache_data):
+            if k != key:
+                return k
+        return None
+
+    @tracked
+    def put(self, key, item, ttl=None):
         """
         dictionary
         """
         if key and item:
-            self.cache_data[key] = item
-        if len(self.cache_data) > BaseCaching.MAX_ITEMS:
-            self.cache_data.pop(self.remove)
-            print("DISCARD: {}".format(self.remove, end=""))
-        if key:
-            self.remove = key
-        else:
-            pass
+            size = self._size(item)
+            if self._make_room(key, size):
+                self._store(key, item, size, ttl)
+                self.cache_data.move_to_end(key)
 
+    @tracked
     def get(self, key):
         """
         get value of key from dict
         """
-        if key is None:
+        if key is None or self._expired(key):
             return None
         return self.cache_data.get(key)
@@ -2,16 +2,16 @@
 """
 LRU Caching
 """
-from base_caching import BaseCaching
+from policy_caching import PolicyCaching, tracked
 
 
-class LRUCache(BaseCaching):
+class LRUCache(PolicyCaching):
     """
     Class that inherits from BaseCaching and is a caching system
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.head, self.tail = '-', '='
         self.next, self.prev = {}, {}
         self.handle(self.head, self.tail)
@@ -22,41 +22,57 @@ class LRUCache(BaseCaching):
         """
         self.next[head], self.prev[tail] = tail, head
 
-    def _remove(self, key):
+    def _unlink(self, key):
         """
-        remove element
+        take element out of the list
         """
         self.handle(self.prev[key], self.next[key])
-        del self.prev[key], self.next[key], self.cache_data[key]
+        del self.prev[key], self.next[key]
 
-    def _add(self, key, item):
+    def _link(self, key):
         """
-        add element
+        append element as the most recently used
         """
-        self.cache_data[key] = item
         self.handle(self.prev[self.tail], key)
         self.handle(key, self.tail)
-        if len(self.cache_data) > BaseCaching.MAX_ITEMS:
-            print("DISCARD: {}".format(self.next[self.head]))
-            self._remove(self.next[self.head])
 
-    def put(self, key, item):
+    def _remove(self, key):
+        """
+        remove element
+        """
+        self._unlink(key)
+        self._forget(key)
+
+    def _victim(self, key):
+        """
+        least recently used key
+        """
+        victim = self.next[self.head]
+        if victim in (self.head, self.tail):
+            return None
+        return victim
+
+    @tracked
+    def put(self, key, item, ttl=None):
         """
         dictionary
         """
         if key and item:
             if key in self.cache_data:
                 self._remove(key)
-            self._add(key, item)
+            size = self._size(item)
+            if self._make_room(key, size):
+                self._store(key, item, size, ttl)
+                self._link(key)
 
+    @tracked
     def get(self, key):
         """
         Return the value linked
         """
-        if key is None or self.cache_data.get(key) is None:
+        if (key is None or self.cache_data.get(key) is None or
+                self._expired(key)):
             return None
-        if key in self.cache_data:
-            value = self.cache_data[key]
-            self._remove(key)
-            self._add(key, value)
-            return value
+        self._unlink(key)
+        self._link(key)
+        return self.cache_data[key]
@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""
+Trace replay: hit ratio of ARCCache next to the other policies on a
+trace of Zipf-distributed hot keys interleaved with one-off scans
+"""
+import random
+
+POLICIES = [
+    __import__('1-fifo_cache').FIFOCache,
+    __import__('2-lifo_cache').LIFOCache,
+    __import__('3-lru_cache').LRUCache,
+    __import__('4-mru_cache').MRUCache,
+    __import__('100-lfu_cache').LFUCache,
+    __import__('103-arc_cache').ARCCache,
+]
+
+CAPACITY = 100
+
+
+def trace(length=200000, hot=500, scan=400, every=5000, seed=0):
+    """
+    hot keys 1 to hot drawn with a 1/key weight, plus a scan of fresh
+    keys every `every` requests; no key is 0, which FIFO, LIFO, LRU and
+    MRU refuse to store
+    """
+    rand = random.Random(seed)
+    weights = [1 / rank for rank in range(1, hot + 1)]
+    keys = rand.choices(range(1, hot + 1), weights, k=length)
+    fresh = hot + 1
+    for i, key in enumerate(keys):
+        if i and i % every == 0:
+            for k in range(fresh, fresh + scan):
+                yield k
+            fresh += scan
+        yield key
+
+
+def hit_ratio(cache, keys):
+    """
+    replay keys through cache with get, put on a miss
+    """
+    hits = total = 0
+    for key in keys:
+        total += 1
+        if cache.get(key) is not None:
+            hits += 1
+        else:
+            cache.put(key, True)
+    return hits / total
+
+
+if __name__ == "__main__":
+    keys = list(trace())
+    for cls in POLICIES:
+        ratio = hit_ratio(cls(max_items=CAPACITY), keys)
+        print("{:<10} hit ratio {:.3f}".format(cls.__name__, ratio))
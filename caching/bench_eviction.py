@@ -0,0 +1,37 @@
+#!/usr/bin/python3
+"""
+Micro-benchmark: FIFO and LIFO eviction cost as capacity grows
+"""
+import time
+
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+LIFOCache = __import__('2-lifo_cache').LIFOCache
+
+CAPACITIES = [4, 100, 10000, 1000000]
+EVICTIONS = 100000
+
+
+def bench(cls, capacity, evictions=EVICTIONS):
+    """
+    fill a cache to capacity, then time puts that each evict one key
+    and return the mean cost of one evicting put in nanoseconds
+    """
+    cache = cls(max_items=capacity)
+    for i in range(capacity):
+        cache.put(i + 1, i)
+    keys = range(capacity + 1, capacity + 1 + evictions)
+    start = time.perf_counter()
+    for key in keys:
+        cache.put(key, key)
+    elapsed = time.perf_counter() - start
+    return elapsed / evictions * 1e9
+
+
+if __name__ == "__main__":
+    for cls in (FIFOCache, LIFOCache):
+        costs = [bench(cls, capacity) for capacity in CAPACITIES]
+        for capacity, cost in zip(CAPACITIES, costs):
+            print("{:<10} capacity={:<8} {:8.1f} ns/eviction".format(
+                cls.__name__, capacity, cost))
+        print("{:<10} largest/smallest ratio: {:.2f}".format(
+            cls.__name__, max(costs) / min(costs)))
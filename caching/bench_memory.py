@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+"""
+Memory benchmark: bytes per entry of LRUCache against SlotLRUCache
+"""
+import gc
+import tracemalloc
+
+LRUCache = __import__('3-lru_cache').LRUCache
+SlotLRUCache = __import__('102-slot_lru_cache').SlotLRUCache
+
+ENTRIES = 1000000
+
+
+def measure(cls, entries=ENTRIES):
+    """
+    bytes allocated per entry by a full cache of entries keys; the keys
+    are created beforehand so only the cache structures are counted
+    """
+    keys = list(range(1, entries + 1))
+    gc.collect()
+    tracemalloc.start()
+    cache = cls(max_items=entries)
+    for key in keys:
+        cache.put(key, True)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del cache
+    return used / entries
+
+
+if __name__ == "__main__":
+    for cls in (LRUCache, SlotLRUCache):
+        print("{:<13} {:7.1f} bytes/entry at {} keys".format(
+            cls.__name__, measure(cls), ENTRIES))
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+Warm start against cold start: time to serve the first requests of a
+worker when every miss costs a slow backend call
+"""
+import os
+import random
+import tempfile
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+PersistentCache = __import__('106-persistent_cache').PersistentCache
+
+CAPACITY = 1000
+KEYS = 20000
+REQUESTS = 5000
+BACKEND_DELAY = 0.0002
+
+
+def trace(length, seed):
+    """
+    keys drawn with a 1/rank weight
+    """
+    rand = random.Random(seed)
+    weights = [1 / rank for rank in range(1, KEYS + 1)]
+    return rand.choices(range(KEYS), weights, k=length)
+
+
+def serve(cache, keys):
+    """
+    get each key, calling the slow backend and put on a miss
+    """
+    start = time.perf_counter()
+    for key in keys:
+        if cache.get(key) is None:
+            time.sleep(BACKEND_DELAY)
+            cache.put(key, key + 1)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    path = os.path.join(tempfile.mkdtemp(), "cache.db")
+    previous = PersistentCache(LRUCache(max_items=CAPACITY), path)
+    serve(previous, trace(50000, 0))
+    previous.close()
+
+    keys = trace(REQUESTS, 1)
+    cold = serve(LRUCache(max_items=CAPACITY), keys)
+    start = time.perf_counter()
+    warm_cache = PersistentCache(LRUCache(max_items=CAPACITY), path)
+    restored = warm_cache.restore()
+    restore = time.perf_counter() - start
+    warm = serve(warm_cache, keys)
+    warm_cache.db.close()
+    os.remove(path)
+    print("cold start {:.3f}s for {} requests".format(cold, REQUESTS))
+    print("warm start {:.3f}s ({:.3f}s restoring {} entries)".format(
+        restore + warm, restore, restored))
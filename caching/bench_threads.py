@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""
+Multi-threaded throughput: one locked cache against a sharded cache
+"""
+import random
+import threading
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+thread_safe = __import__('101-thread_safe_cache')
+ThreadSafeCache = thread_safe.ThreadSafeCache
+ShardedCache = thread_safe.ShardedCache
+
+CAPACITY = 4096
+SHARDS = 16
+KEYS = 16384
+OPS = 50000
+
+
+def worker(cache, seed, ops=OPS):
+    """
+    mix of 80% get and 20% put on random keys
+    """
+    rand = random.Random(seed)
+    for _ in range(ops):
+        key = rand.randrange(KEYS)
+        if rand.random() < 0.8:
+            if cache.get(key) is None:
+                cache.put(key, key)
+        else:
+            cache.put(key, key)
+
+
+def bench(cache, threads):
+    """
+    run worker on threads threads and return operations per second
+    """
+    pool = [threading.Thread(target=worker, args=(cache, i))
+            for i in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return threads * OPS / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    for threads in (1, 2, 4, 8):
+        single = bench(ThreadSafeCache(LRUCache(max_items=CAPACITY)),
+                       threads)
+        sharded = bench(ShardedCache(
+            lambda: LRUCache(max_items=CAPACITY // SHARDS), SHARDS),
+            threads)
+        print("threads={:<2} locked {:10.0f} ops/s  sharded {:10.0f} ops/s"
+              .format(threads, single, sharded))
@@ -0,0 +1,222 @@
+#!/usr/bin/python3
+"""
+Shared capacity, expiry and statistics handling for the caching policies
+"""
+import heapq
+import itertools
+import sys
+import time
+from functools import wraps
+from base_caching import BaseCaching
+
+
+def tracked(method):
+    """
+    count hits and misses of get and, when the cache is timed, record
+    the latency of the call in a power-of-two nanosecond histogram
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.latency is None:
+            result = method(self, *args, **kwargs)
+        else:
+            start = time.perf_counter_ns()
+            result = method(self, *args, **kwargs)
+            elapsed = time.perf_counter_ns() - start
+            self.latency[name][elapsed.bit_length()] += 1
+        if name == 'get':
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+    return wrapper
+
+
+class PolicyCaching(BaseCaching):
+    """
+    BaseCaching with a per-instance capacity, an optional byte budget,
+    optional expiry of entries and usage statistics.
+
+    Subclasses pick the key to evict in `_victim` and drop it from their
+    own bookkeeping in `_remove`.
+    """
+
+    def __init__(self, max_items=None, max_bytes=None, sizeof=None,
+                 ttl=None, sweep_limit=20, clock=time.monotonic,
+                 verbose=False, on_evict=None, timed=False):
+        """
+        max_items defaults to BaseCaching.MAX_ITEMS, max_bytes to no
+        budget; sizeof(item) returns the size charged to the budget.
+        ttl is the default lifetime in seconds of an entry (None: never
+        expires) and each put inspects at most sweep_limit deadlines.
+        verbose prints a DISCARD line per eviction, on_evict(key, item)
+        is called before each eviction and timed records get and put
+        latencies for stats().
+        """
+        super().__init__()
+        if max_items is None:
+            max_items = BaseCaching.MAX_ITEMS
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sys.getsizeof if sizeof is None else sizeof
+        self.sizes = {}
+        self.nbytes = 0
+        self.ttl = ttl
+        self.sweep_limit = sweep_limit
+        self.clock = clock
+        self.expires = {}
+        self.deadlines = []
+        self.counter = itertools.count()
+        self.verbose = verbose
+        self.on_evict = on_evict
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self.latency = None
+        if timed:
+            self.latency = {'get': [0] * 64, 'put': [0] * 64}
+
+    def _size(self, item):
+        """
+        bytes charged for item, 0 when there is no byte budget
+        """
+        if self.max_bytes is None:
+            return 0
+        return self.sizeof(item)
+
+    def _over(self, key, size):
+        """
+        True when storing key with an item of size would not fit
+        """
+        count = len(self.cache_data) + (key not in self.cache_data)
+        if self.max_items is not None and count > self.max_items:
+            return True
+        if self.max_bytes is None:
+            return False
+        return self.nbytes - self.sizes.get(key, 0) + size > self.max_bytes
+
+    def _make_room(self, key, size):
+        """
+        discard victims until key fits, return False if it never can
+        """
+        if self.deadlines:
+            self.sweep(self.sweep_limit, key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return False
+        while self._over(key, size):
+            victim = self._victim(key)
+            if victim is None:
+                return False
+            self._discard(victim)
+        return True
+
+    def _store(self, key, item, size, ttl=None):
+        """
+        write item into cache_data, charge its size and set its deadline
+        """
+        self.nbytes += size - self.sizes.get(key, 0)
+        if self.max_bytes is not None:
+            self.sizes[key] = size
+        self.cache_data[key] = item
+        if ttl is None:
+            ttl = self.ttl
+        if ttl is None:
+            self.expires.pop(key, None)
+            return
+        deadline = self.clock() + ttl
+        self.expires[key] = deadline
+        heapq.heappush(self.deadlines, (deadline, next(self.counter), key))
+        if len(self.deadlines) > 2 * len(self.expires) + 64:
+            self.deadlines = [(d, n, k) for d, n, k in self.deadlines
+                              if self.expires.get(k) == d]
+            heapq.heapify(self.deadlines)
+
+    def _forget(self, key):
+        """
+        delete key from cache_data and release its size
+        """
+        self.nbytes -= self.sizes.pop(key, 0)
+        self.expires.pop(key, None)
+        del self.cache_data[key]
+
+    def _expired(self, key):
+        """
+        remove key and return True if its deadline has passed
+        """
+        deadline = self.expires.get(key)
+        if deadline is None or deadline > self.clock():
+            return False
+        self._remove(key)
+        self.expirations += 1
+        return True
+
+    def sweep(self, limit=None, keep=None):
+        """
+        remove expired entries, inspecting at most limit deadlines in
+        expiry order; keep is left alone. Return the number removed.
+        """
+        now = self.clock()
+        kept = None
+        inspected = removed = 0
+        while (self.deadlines and self.deadlines[0][0] <= now and
+               (limit is None or inspected < limit)):
+            entry = heapq.heappop(self.deadlines)
+            deadline, _, key = entry
+            inspected += 1
+            if self.expires.get(key) != deadline:
+                continue
+            if key == keep:
+                kept = entry
+            else:
+                self._remove(key)
+                removed += 1
+        self.expirations += removed
+        if kept is not None:
+            heapq.heappush(self.deadlines, kept)
+        return removed
+
+    def _discard(self, key):
+        """
+        evict key
+        """
+        if self.on_evict is not None:
+            self.on_evict(key, self.cache_data[key])
+        if self.verbose:
+            print("DISCARD: {}".format(key))
+        self._remove(key)
+        self.evictions += 1
+
+    def _remove(self, key):
+        """
+        remove key from the policy, overload to drop extra bookkeeping
+        """
+        self._forget(key)
+
+    def _victim(self, key):
+        """
+        key to evict to make room for key, None when nothing can go
+        """
+        return None
+
+    def stats(self):
+        """
+        counters of the cache; latency maps each operation to
+        {upper bound in ns: calls} when the cache is timed
+        """
+        lookups = self.hits + self.misses
+        result = {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'size': len(self.cache_data),
+            'bytes': self.nbytes,
+        }
+        if self.latency is not None:
+            result['latency'] = {
+                op: {1 << bit: n for bit, n in enumerate(hist) if n}
+                for op, hist in self.latency.items()
+            }
+        return result
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""
+Caching test suite
+"""
+import asyncio
+import unittest
+
+simulator = __import__('107-cache_simulator')
+AsyncCache = __import__('105-async_cache').AsyncCache
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+class TestSimulator(unittest.TestCase):
+    """
+    Test suite for the trace-driven simulator
+    """
+
+    def test_policies_cache_every_key(self):
+        """
+        every policy stores every key of every generated trace
+        """
+        for generator in simulator.GENERATORS.values():
+            trace = generator(20000, 1000)
+            for name in simulator.POLICIES:
+                with self.subTest(generator=generator.__name__,
+                                  policy=name):
+                    self.assertEqual(simulator.refused(name, trace), [])
+
+    def test_refused(self):
+        """
+        a key the policy drops is reported
+        """
+        self.assertEqual(simulator.refused('LRUCache', [0, 1]), [0])
+        self.assertEqual(simulator.refused('LFUCache', [0, 1]), [])
+
+
+class TestAsyncCache(unittest.TestCase):
+    """
+    Test suite for AsyncCache
+    """
+
+    def test_falsy_key(self):
+        """
+        a falsy key is loaded once, then served from the cache
+        """
+        loads = []
+
+        async def loader(key):
+            loads.append(key)
+            return key
+
+        async def run():
+            cache = AsyncCache(LRUCache(), loader)
+            for key in (0, 0, '', ''):
+                self.assertEqual(await cache.get(key), key)
+            cache.put(False, 'stored')
+            self.assertEqual(await cache.get(False), 'stored')
+
+        asyncio.run(run())
+        self.assertEqual(loads, [0, ''])
+
+
+if __name__ == "__main__":
+    unittest.main()
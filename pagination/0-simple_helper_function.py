@@ -2,7 +2,7 @@
 """
 Simple helper function for pagination
 """
-from typing import Tuple
+from typing import Iterable, Tuple, Union
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -16,11 +16,29 @@ def index_range(page: int, page_size: int) -> Tuple[int, int]:
     Returns:
         Tuple A tuple containing the start and end index for the page
     """
-    end: int = page * page_size
+    start: int = (page - 1) * page_size
+    end: int = start + page_size
 
-    start: int = 0
+    return (start, end)
 
-    for i in range(page - 1):
-        start += page_size
 
-    return (start, end)
+def index_ranges(pages: Iterable[int],
+                 page_sizes: Union[int, Iterable[int]]) -> Tuple:
+    """
+    Calculate the start and end indexes of many pages at once.
+
+    Args:
+        pages: The page numbers, as a sequence or NumPy array.
+        page_sizes: One page size for every page, or a page size each.
+
+    Returns:
+        Tuple of two int64 NumPy arrays: the start and end indexes
+    """
+    import numpy as np
+
+    pages = np.asarray(pages, dtype=np.int64)
+    page_sizes = np.broadcast_to(np.asarray(page_sizes, dtype=np.int64),
+                                 pages.shape)
+    starts = (pages - 1) * page_sizes
+
+    return (starts, starts + page_sizes)
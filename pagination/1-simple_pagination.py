@@ -32,10 +32,8 @@ class Server:
         Calculate and return a tuple containing a start index and an end index
         for the specified pagination parameters.
         """
-        end: int = page * page_size
-        start: int = 0
-        for _ in range(page - 1):
-            start += page_size
+        start: int = (page - 1) * page_size
+        end: int = start + page_size
         return (start, end)
 
     def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
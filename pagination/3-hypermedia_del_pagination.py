@@ -5,7 +5,138 @@ Deletion-resilient hypermedia pagination
 
 import csv
 import math
-from typing import List, Dict
+from array import array
+from typing import Iterator, List, Dict, Tuple
+
+
+class LiveIndex:
+    """Rows by position with deletions tracked in a Fenwick tree.
+
+    Behaves like the {position: row} dict it replaces, but deleting or
+    inserting a position is O(log n) and finding the next live rows from
+    any position costs O(log n) per run of deleted positions skipped
+    plus O(1) per row returned.
+    """
+
+    def __init__(self, rows: List[List]):
+        """Index every row of rows as live."""
+        self.__rows = list(rows)
+        self.__alive = bytearray(b'\1') * len(self.__rows)
+        self.__live = len(self.__rows)
+        self.__tree = array('l', [0]) * (len(self.__rows) + 1)
+        for i in range(1, len(self.__tree)):
+            self.__tree[i] += 1
+            parent = i + (i & -i)
+            if parent < len(self.__tree):
+                self.__tree[parent] += self.__tree[i]
+
+    def __add(self, position: int, delta: int) -> None:
+        """Add delta to the count of position."""
+        i = position + 1
+        while i < len(self.__tree):
+            self.__tree[i] += delta
+            i += i & -i
+
+    def rank(self, position: int) -> int:
+        """Number of live rows before position."""
+        total, i = 0, min(position, len(self.__rows))
+        while i > 0:
+            total += self.__tree[i]
+            i -= i & -i
+        return total
+
+    def select(self, k: int) -> int:
+        """Position of the live row with rank k, len(positions) if none."""
+        if k >= self.__live:
+            return len(self.__rows)
+        position, step = 0, 1 << (len(self.__tree) - 1).bit_length()
+        while step:
+            i = position + step
+            if i < len(self.__tree) and self.__tree[i] <= k:
+                position = i
+                k -= self.__tree[i]
+            step >>= 1
+        return position
+
+    @property
+    def positions(self) -> int:
+        """Number of positions, live or deleted."""
+        return len(self.__rows)
+
+    def __len__(self) -> int:
+        """Number of live rows."""
+        return self.__live
+
+    def __contains__(self, position: int) -> bool:
+        """True if position holds a live row."""
+        return (isinstance(position, int) and
+                0 <= position < len(self.__rows) and
+                bool(self.__alive[position]))
+
+    def __getitem__(self, position: int) -> List:
+        """Live row at position."""
+        if position not in self:
+            raise KeyError(position)
+        return self.__rows[position]
+
+    def get(self, position: int, default=None):
+        """Live row at position, or default."""
+        return self.__rows[position] if position in self else default
+
+    def __delitem__(self, position: int) -> None:
+        """Delete the row at position; later positions keep theirs."""
+        if position not in self:
+            raise KeyError(position)
+        self.__alive[position] = 0
+        self.__rows[position] = None
+        self.__live -= 1
+        self.__add(position, -1)
+
+    def __setitem__(self, position: int, row: List) -> None:
+        """Insert or replace the row at position, growing if needed."""
+        if position < 0:
+            raise KeyError(position)
+        while len(self.__rows) <= position:
+            self.__append()
+        if not self.__alive[position]:
+            self.__alive[position] = 1
+            self.__live += 1
+            self.__add(position, 1)
+        self.__rows[position] = row
+
+    def __append(self) -> None:
+        """Add one deleted position at the end."""
+        i = len(self.__tree)
+        self.__rows.append(None)
+        self.__alive.append(0)
+        self.__tree.append(self.rank(i - 1) - self.rank(i - (i & -i)))
+
+    def page(self, index: int, size: int) -> Tuple[List[List], int]:
+        """Up to size live rows from position index on, and the position
+        right after the last one returned."""
+        k = self.rank(index)
+        position = self.select(k)
+        data = []
+        while len(data) < size and position < len(self.__rows):
+            if self.__alive[position]:
+                data.append(self.__rows[position])
+                k += 1
+                position += 1
+            else:
+                position = self.select(k)
+        return data, position
+
+    def __iter__(self) -> Iterator[int]:
+        """Live positions in order."""
+        return (i for i, alive in enumerate(self.__alive) if alive)
+
+    def keys(self) -> Iterator[int]:
+        """Live positions in order."""
+        return iter(self)
+
+    def items(self) -> Iterator[Tuple[int, List]]:
+        """(position, row) of live rows in order."""
+        return ((i, self.__rows[i]) for i in self)
 
 
 class Server:
@@ -28,31 +159,25 @@ class Server:
 
         return self.__dataset
 
-    def indexed_dataset(self) -> Dict[int, List]:
+    def indexed_dataset(self) -> LiveIndex:
         """Dataset indexed by sorting position, starting at 0
         """
         if self.__indexed_dataset is None:
-            dataset = self.dataset()
-            truncated_dataset = dataset[:1000]
-            self.__indexed_dataset = {
-                i: dataset[i] for i in range(len(dataset))
-            }
+            self.__indexed_dataset = LiveIndex(self.dataset())
         return self.__indexed_dataset
 
     def get_hyper_index(self, index: int = None, page_size: int = 10) -> Dict:
         """Retrieve a page of data from the dataset"""
 
         indexed_dataset = self.indexed_dataset()
-        total_rows = len(indexed_dataset)
+        total_rows = indexed_dataset.positions
 
         assert index is None or (0 <= index < total_rows), "Invalid index"
 
         current_index = 0 if index is None else index
 
-        next_index = min(current_index + page_size, total_rows)
-
-        current_page_data = [indexed_dataset[i]
-                             for i in range(current_index, next_index)]
+        current_page_data, next_index = indexed_dataset.page(current_index,
+                                                             page_size)
         result = {
             "index": current_index,
             "next_index": next_index,
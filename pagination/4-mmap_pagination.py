@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Hypermedia pagination over a memory-mapped columnar copy of the dataset.
+
+The CSV is converted once into a binary file holding each column in the
+smallest of three encodings: the UTF-8 bytes of its cells after an array
+of their offsets, one code per row into a dictionary of its distinct
+values, or, for integer columns, the integers themselves. Offsets, codes
+and integers use the narrowest array type that holds them. Pages decode
+only their own rows straight from the mapping.
+"""
+import csv
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from math import ceil
+from typing import Callable, Iterator, List, Sequence, Tuple, Union
+
+index_range = __import__('0-simple_helper_function').index_range
+
+MAGIC = b'PBN2'
+HEADER = struct.Struct('=4sQI')
+COLUMN = struct.Struct('=3c5xQQQ')
+PLAIN, DICTIONARY, INTEGER = b'p', b'd', b'i'
+UNSIGNED, SIGNED = 'BHIQ', 'bhiq'
+
+
+def _align(n: int) -> int:
+    """Round n up to a multiple of 8 so arrays stay aligned."""
+    return (n + 7) & ~7
+
+
+def _typecode(low: int, high: int, typecodes: str = UNSIGNED) -> str:
+    """Narrowest array typecode among typecodes holding low..high."""
+    for typecode in typecodes:
+        try:
+            array(typecode, [low, high])
+            return typecode
+        except OverflowError:
+            continue
+    raise OverflowError("{}..{} does not fit any array".format(low, high))
+
+
+def _strings(cells: List[bytes]) -> Tuple[bytes, bytes]:
+    """Offset typecode and bytes of cells stored as offsets then blob."""
+    offsets = array('Q', [0])
+    for cell in cells:
+        offsets.append(offsets[-1] + len(cell))
+    typecode = _typecode(0, offsets[-1])
+    data = array(typecode, offsets).tobytes() + b''.join(cells)
+    return typecode.encode(), data
+
+
+def _encode(cells: List[str]) -> Tuple[bytes, bytes, bytes, int,
+                                       bytes, bytes]:
+    """Smallest encoding of a column: its kind, code and offset
+    typecodes, count of strings, and the bytes stored at its start and
+    auxiliary positions."""
+    encoded = [cell.encode() for cell in cells]
+    offset_type, data = _strings(encoded)
+    best = (PLAIN, b'-', offset_type, len(cells), data, b'')
+
+    values = list(dict.fromkeys(encoded))
+    positions = {value: code for code, value in enumerate(values)}
+    code_type = _typecode(0, max(len(values) - 1, 0))
+    codes = array(code_type, [positions[cell] for cell in encoded])
+    offset_type, data = _strings(values)
+    if len(codes) * codes.itemsize + len(data) < len(best[4]):
+        best = (DICTIONARY, code_type.encode(), offset_type, len(values),
+                codes.tobytes(), data)
+
+    try:
+        numbers = [int(cell) for cell in cells]
+    except ValueError:
+        return best
+    if cells and all(str(n) == cell for n, cell in zip(numbers, cells)):
+        try:
+            code_type = _typecode(min(numbers), max(numbers), SIGNED)
+        except OverflowError:
+            return best
+        data = array(code_type, numbers).tobytes()
+        if len(data) < len(best[4]) + len(best[5]):
+            best = (INTEGER, code_type.encode(), b'-', 0, data, b'')
+    return best
+
+
+def build_columnar(csv_path: str, out_path: str) -> None:
+    """Convert csv_path, header row excluded, into the columnar file."""
+    columns: List[List[str]] = []
+    rows = 0
+    with open(csv_path, newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            if not columns:
+                columns = [[] for _ in row]
+            for column, cell in zip(columns, row):
+                column.append(cell)
+            rows += 1
+
+    encoded = [_encode(column) for column in columns]
+    position = _align(HEADER.size + COLUMN.size * len(encoded))
+    directory = []
+    for kind, code_type, offset_type, count, data, aux in encoded:
+        start = position
+        position = _align(start + len(data))
+        aux_start = position if aux else 0
+        position = _align(position + len(aux))
+        directory.append((kind, code_type, offset_type, start, aux_start,
+                          count))
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(out_path) or '.',
+        prefix=os.path.basename(out_path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, rows, len(directory)))
+            for entry in directory:
+                f.write(COLUMN.pack(*entry))
+            for entry, (_, _, _, _, data, aux) in zip(directory, encoded):
+                f.write(b'\0' * (entry[3] - f.tell()))
+                f.write(data)
+                if aux:
+                    f.write(b'\0' * (entry[4] - f.tell()))
+                    f.write(aux)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def is_stale(csv_path: str, columnar_path: str) -> bool:
+    """True if columnar_path is missing, older than csv_path or written
+    in another format."""
+    if (not os.path.exists(columnar_path) or
+            os.path.getmtime(columnar_path) < os.path.getmtime(csv_path)):
+        return True
+    with open(columnar_path, 'rb') as f:
+        return f.read(len(MAGIC)) != MAGIC
+
+
+class ColumnarDataset(Sequence):
+    """Read-only rows of a columnar file held in any buffer."""
+
+    def __init__(self, buffer: Union[mmap.mmap, memoryview, bytes]):
+        """Parse the header and directory of buffer."""
+        view = memoryview(buffer)
+        magic, self.__rows, n_columns = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("not a columnar dataset")
+        self.__buffer = buffer
+        self.__views = []
+        self.__cells = []
+        for i in range(n_columns):
+            kind, code_type, offset_type, start, aux, count = (
+                COLUMN.unpack_from(view, HEADER.size + i * COLUMN.size))
+            if kind == PLAIN:
+                self.__cells.append(self.__strings(view, offset_type, start,
+                                                   count))
+                continue
+            codes = self.__array(view, code_type, start, self.__rows)
+            if kind == DICTIONARY:
+                cell = self.__strings(view, offset_type, aux, count)
+                values = [cell(code) for code in range(count)]
+                self.__cells.append(lambda j, c=codes, v=values: v[c[j]])
+            else:
+                self.__cells.append(lambda j, c=codes: str(c[j]))
+
+    def __array(self, view: memoryview, typecode: bytes, start: int,
+                count: int) -> memoryview:
+        """count items of typecode at start, as a view kept to release."""
+        size = array(typecode.decode()).itemsize
+        items = view[start:start + count * size].cast(typecode.decode())
+        self.__views.append(items)
+        return items
+
+    def __strings(self, view: memoryview, typecode: bytes, start: int,
+                  count: int) -> Callable[[int], str]:
+        """Decoder of the count strings stored as offsets then blob."""
+        index = self.__array(view, typecode, start, count + 1)
+        blob = start + index.nbytes
+        buffer = self.__buffer
+        return lambda j: str(buffer[blob + index[j]:blob + index[j + 1]],
+                             'utf-8')
+
+    def __len__(self) -> int:
+        """Number of rows."""
+        return self.__rows
+
+    def row(self, i: int) -> List[str]:
+        """Decode row i."""
+        return [cell(i) for cell in self.__cells]
+
+    def __getitem__(self, i):
+        """Decode one row, or a list of rows for a slice."""
+        if isinstance(i, slice):
+            return [self.row(j) for j in range(*i.indices(self.__rows))]
+        if i < 0:
+            i += self.__rows
+        if not 0 <= i < self.__rows:
+            raise IndexError("row index out of range")
+        return self.row(i)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        """Decode rows in order."""
+        return (self.row(i) for i in range(self.__rows))
+
+    def release(self) -> None:
+        """Drop the views on the buffer so it can be closed."""
+        for items in self.__views:
+            items.release()
+        self.__views = []
+        self.__cells = []
+
+
+class Server:
+    """Server class for pagination backed by a memory-mapped file."""
+    DATA_FILE = "Popular_Baby_Names.csv"
+
+    def __init__(self):
+        """Initialize the server instance."""
+        self.__dataset = None
+        self.__lock = threading.Lock()
+
+    @property
+    def columnar_file(self) -> str:
+        """Path of the converted dataset, next to the CSV."""
+        return self.DATA_FILE + ".col"
+
+    def dataset(self) -> ColumnarDataset:
+        """Map the columnar file, converting the CSV first if stale.
+        Threads calling it together wait for a single conversion."""
+        with self.__lock:
+            if self.__dataset is None:
+                path = self.columnar_file
+                if is_stale(self.DATA_FILE, path):
+                    build_columnar(self.DATA_FILE, path)
+                with open(path, 'rb') as f:
+                    mapping = mmap.mmap(f.fileno(), 0,
+                                        access=mmap.ACCESS_READ)
+                self.__dataset = ColumnarDataset(mapping)
+        return self.__dataset
+
+    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
+        """Return a specific page of the dataset."""
+        assert isinstance(page, int) and isinstance(page_size, int)
+        assert page > 0 and page_size > 0
+        start, end = index_range(page, page_size)
+        return self.dataset()[start:end]
+
+    def get_hyper(self, page: int = 1, page_size: int = 10) -> dict:
+        """Return a dictionary representing pagination information."""
+        page_data = self.get_page(page, page_size)
+        total_pages = ceil(len(self.dataset()) / page_size)
+
+        return {
+            'page_size': len(page_data),
+            'page': page,
+            'data': page_data,
+            'next_page': page + 1 if page < total_pages else None,
+            'prev_page': page - 1 if page != 1 else None,
+            'total_pages': total_pages
+        }
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Hypermedia pagination streamed straight from the CSV file.
+
+Instead of loading the dataset, the server records the byte offset of
+every Kth row as it reads forward, then seeks next to the first row of
+a page and parses only that page. Rows are assumed to be one per line.
+"""
+import csv
+from array import array
+from math import ceil
+from typing import List, Sequence
+
+index_range = __import__('0-simple_helper_function').index_range
+
+
+class StreamingDataset(Sequence):
+    """Rows of a CSV file read on demand through a sparse offset index."""
+
+    def __init__(self, path: str, stride: int = 256):
+        """Index nothing yet; offsets of every stride-th row come later."""
+        assert isinstance(stride, int) and stride > 0
+        self.path = path
+        self.stride = stride
+        self.__offsets = array('Q')
+        self.__rows = 0
+        self.__position = None
+        self.__complete = False
+
+    def __index_to(self, row: int) -> None:
+        """Extend the index until it covers row, or the end of file."""
+        with open(self.path, 'rb') as f:
+            if self.__position is None:
+                f.readline()
+                self.__position = f.tell()
+            f.seek(self.__position)
+            position = self.__position
+            while self.__rows <= row:
+                line = f.readline()
+                if not line:
+                    self.__complete = True
+                    break
+                if self.__rows % self.stride == 0:
+                    self.__offsets.append(position)
+                position += len(line)
+                self.__rows += 1
+            self.__position = position
+
+    def __len__(self) -> int:
+        """Number of rows, indexing the rest of the file once."""
+        if not self.__complete:
+            self.__index_to(float('inf'))
+        return self.__rows
+
+    def rows(self, start: int, end: int) -> List[List[str]]:
+        """Parse rows start to end - 1, fewer past the end of file."""
+        if end <= start:
+            return []
+        if start >= self.__rows and not self.__complete:
+            self.__index_to(start)
+        if start >= self.__rows:
+            return []
+        block, skip = divmod(start, self.stride)
+        with open(self.path, 'rb') as f:
+            f.seek(self.__offsets[block])
+            for _ in range(skip):
+                f.readline()
+            lines = []
+            for _ in range(end - start):
+                line = f.readline()
+                if not line:
+                    break
+                lines.append(line.decode())
+        return [row for row in csv.reader(lines)]
+
+    def __getitem__(self, i):
+        """One row, or a list of rows for a slice with step 1."""
+        if isinstance(i, slice):
+            if (i.step not in (None, 1) or
+                    (i.start or 0) < 0 or (i.stop or 0) < 0):
+                return list(self)[i]
+            start = i.start or 0
+            stop = len(self) if i.stop is None else i.stop
+            return self.rows(start, stop)
+        if i < 0:
+            i += len(self)
+        rows = self.rows(i, i + 1) if i >= 0 else []
+        if not rows:
+            raise IndexError("row index out of range")
+        return rows[0]
+
+    def __iter__(self):
+        """Stream every row."""
+        with open(self.path, newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            yield from reader
+
+
+class Server:
+    """Server class for pagination streaming from the CSV file."""
+    DATA_FILE = "Popular_Baby_Names.csv"
+    STRIDE = 256
+
+    def __init__(self):
+        """Initialize the server instance."""
+        self.__dataset = None
+
+    def dataset(self) -> StreamingDataset:
+        """Sparse-indexed view of the CSV file."""
+        if self.__dataset is None:
+            self.__dataset = StreamingDataset(self.DATA_FILE, self.STRIDE)
+        return self.__dataset
+
+    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
+        """Return a specific page of the dataset."""
+        assert isinstance(page, int) and isinstance(page_size, int)
+        assert page > 0 and page_size > 0
+        start, end = index_range(page, page_size)
+        return self.dataset().rows(start, end)
+
+    def get_hyper(self, page: int = 1, page_size: int = 10) -> dict:
+        """Return a dictionary representing pagination information."""
+        page_data = self.get_page(page, page_size)
+        total_pages = ceil(len(self.dataset()) / page_size)
+
+        return {
+            'page_size': len(page_data),
+            'page': page,
+            'data': page_data,
+            'next_page': page + 1 if page < total_pages else None,
+            'prev_page': page - 1 if page != 1 else None,
+            'total_pages': total_pages
+        }
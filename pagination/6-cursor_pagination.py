@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Cursor-based hypermedia pagination for a dataset of popular baby names.
+
+A page is asked for with the opaque cursor returned by the previous one.
+The cursor carries the sort key of the last row seen and the sort
+column it was made for, signed so clients cannot forge it; a server
+sorting on another column refuses it. The next page starts right after
+that key in a sorted index: deep pages cost the same as the first one
+and rows inserted meanwhile neither repeat nor hide rows that follow
+the cursor.
+"""
+import base64
+import bisect
+import csv
+import hashlib
+import hmac
+import json
+import os
+from typing import List, Optional, Tuple
+
+
+class Server:
+    """Server class for keyset pagination."""
+    DATA_FILE = "Popular_Baby_Names.csv"
+
+    def __init__(self, sort_column: Optional[int] = None,
+                 secret: Optional[bytes] = None):
+        """Sort by the column at sort_column, file order when None.
+
+        secret signs the cursors; it defaults to the PAGINATION_SECRET
+        environment variable, else to a random per-process key.
+        """
+        self.sort_column = sort_column
+        if secret is None:
+            secret = os.environ.get('PAGINATION_SECRET', '').encode()
+        self.__secret = secret or os.urandom(32)
+        self.__dataset = None
+        self.__keys = None
+        self.__positions = None
+
+    def dataset(self) -> List[List]:
+        """Retrieve and cache the dataset from the CSV file."""
+        if self.__dataset is None:
+            with open(self.DATA_FILE) as f:
+                reader = csv.reader(f)
+                dataset = [row for row in reader]
+            self.__dataset = dataset[1:]
+
+        return self.__dataset
+
+    def sort_key(self, position: int) -> Tuple:
+        """Sort key of the row at position; ties fall back to position."""
+        if self.sort_column is None:
+            return (position,)
+        value = self.dataset()[position][self.sort_column]
+        return (int(value) if value.isdigit() else value, position)
+
+    def index(self) -> Tuple[List[Tuple], List[int]]:
+        """Sort keys of every row in order, and their row positions."""
+        if self.__keys is None:
+            keys = sorted((self.sort_key(i), i)
+                          for i in range(len(self.dataset())))
+            self.__keys = [key for key, _ in keys]
+            self.__positions = [position for _, position in keys]
+        return self.__keys, self.__positions
+
+    def insert(self, row: List) -> None:
+        """Append row to the dataset and to the sorted index."""
+        keys, positions = self.index()
+        self.dataset().append(row)
+        key = self.sort_key(len(self.dataset()) - 1)
+        at = bisect.bisect_right(keys, key)
+        keys.insert(at, key)
+        positions.insert(at, len(self.dataset()) - 1)
+
+    def __sign(self, payload: bytes) -> str:
+        """Signature of payload."""
+        digest = hmac.new(self.__secret, payload, hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest[:16]).decode().rstrip('=')
+
+    def encode_cursor(self, key: Tuple) -> str:
+        """Opaque signed cursor for the sort key key of this sort."""
+        payload = json.dumps([self.sort_column, list(key)],
+                             separators=(',', ':')).encode()
+        body = base64.urlsafe_b64encode(payload).decode().rstrip('=')
+        return "{}.{}".format(body, self.__sign(payload))
+
+    def decode_cursor(self, cursor: str) -> Tuple:
+        """Sort key carried by cursor; ValueError if it was tampered
+        with or made for another sort column."""
+        try:
+            body, signature = cursor.split('.')
+            payload = base64.urlsafe_b64decode(body + '=' * (-len(body) % 4))
+        except (ValueError, AttributeError):
+            raise ValueError("Invalid cursor")
+        if not hmac.compare_digest(signature.encode(),
+                                   self.__sign(payload).encode()):
+            raise ValueError("Invalid cursor")
+        sort_column, key = json.loads(payload)
+        if sort_column != self.sort_column:
+            raise ValueError("Cursor made for another sort column")
+        return tuple(key)
+
+    def get_hyper_cursor(self, cursor: Optional[str] = None,
+                         page_size: int = 10) -> dict:
+        """Return the page after cursor, from the start when None."""
+        assert isinstance(page_size, int) and page_size > 0
+        keys, positions = self.index()
+        start = 0
+        if cursor is not None:
+            start = bisect.bisect_right(keys, self.decode_cursor(cursor))
+        end = min(start + page_size, len(keys))
+        dataset = self.dataset()
+        page_data = [dataset[positions[i]] for i in range(start, end)]
+
+        return {
+            'page_size': len(page_data),
+            'cursor': cursor,
+            'data': page_data,
+            'next_cursor': (self.encode_cursor(keys[end - 1])
+                            if end < len(keys) else None),
+        }
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Filtered and sorted hypermedia pagination for popular baby names.
+
+Secondary indexes are built the first time a column is queried: a
+bitmap (a Python int, bit i for row i) per value of a categorical
+column and a sorted permutation of row positions per sort column.
+A query ANDs the bitmaps of its filters and walks its set bits, or the
+permutation of its sort column, only as far as the page asked for; the
+walk is cached with the positions found so far, so the next page of the
+query resumes it.
+"""
+import threading
+from collections import OrderedDict
+from itertools import islice
+from math import ceil
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+HyperServer = __import__('2-hypermedia_pagination').Server
+index_range = __import__('0-simple_helper_function').index_range
+
+COLUMNS = {
+    "Year of Birth": 0,
+    "Gender": 1,
+    "Ethnicity": 2,
+    "Child's First Name": 3,
+    "Count": 4,
+    "Rank": 5,
+}
+CATEGORICAL = ("Year of Birth", "Gender", "Ethnicity")
+NUMERIC = ("Year of Birth", "Count", "Rank")
+
+
+def popcount(mask: int) -> int:
+    """Number of bits set in mask."""
+    if hasattr(mask, 'bit_count'):
+        return mask.bit_count()
+    return bin(mask).count('1')
+
+
+class Server(HyperServer):
+    """Server class for filtered and sorted pagination."""
+    QUERY_CACHE_SIZE = 32
+
+    def __init__(self):
+        """Initialize the server instance with no index built yet."""
+        super().__init__()
+        self.__bitmaps = {}
+        self.__permutations = {}
+        self.__queries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def bitmaps(self, column: str) -> Dict[str, int]:
+        """Bitmap of the rows holding each value of column."""
+        assert column in CATEGORICAL, "Not a categorical column"
+        if column not in self.__bitmaps:
+            i = COLUMNS[column]
+            positions = {}
+            for position, row in enumerate(self.dataset()):
+                positions.setdefault(row[i], []).append(position)
+            bitmaps = {}
+            for value, rows in positions.items():
+                bits = bytearray((len(self.dataset()) + 7) // 8)
+                for p in rows:
+                    bits[p >> 3] |= 1 << (p & 7)
+                bitmaps[value] = int.from_bytes(bits, 'little')
+            self.__bitmaps[column] = bitmaps
+        return self.__bitmaps[column]
+
+    def permutation(self, column: str,
+                    descending: bool = False) -> List[int]:
+        """Row positions sorted by column, then by position."""
+        assert column in COLUMNS, "Unknown column"
+        if descending:
+            if (column, True) not in self.__permutations:
+                self.__permutations[column, True] = self.permutation(
+                    column)[::-1]
+            return self.__permutations[column, True]
+        if column not in self.__permutations:
+            i = COLUMNS[column]
+            dataset = self.dataset()
+            if column in NUMERIC:
+                def key(p): return int(dataset[p][i])
+            else:
+                def key(p): return dataset[p][i]
+            self.__permutations[column] = sorted(range(len(dataset)),
+                                                 key=key)
+        return self.__permutations[column]
+
+    def walk(self, mask: int, sort_by: Optional[str],
+             descending: bool) -> Iterator[int]:
+        """Positions of the rows whose bit is set in mask, in the order
+        of sort_by (position when None), one at a time."""
+        if sort_by is not None:
+            selected = mask.to_bytes((len(self.dataset()) + 7) // 8,
+                                     'little')
+            for position in self.permutation(sort_by, descending):
+                if selected[position >> 3] >> (position & 7) & 1:
+                    yield position
+        elif descending:
+            while mask:
+                position = mask.bit_length() - 1
+                mask ^= 1 << position
+                yield position
+        else:
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                yield low.bit_length() - 1
+
+    def matches(self, filters: Dict[str, str], sort_by: Optional[str],
+                descending: bool,
+                end: Optional[int] = None) -> Tuple[int, Sequence[int]]:
+        """Number of rows of a query, and their positions in order: at
+        least the first end of them, all of them when end is None.
+        Threads asking for the same query resume its walk one at a time."""
+        query = (tuple(sorted((c, str(v)) for c, v in filters.items())),
+                 sort_by, descending)
+        with self.__lock:
+            if query in self.__queries:
+                self.__queries.move_to_end(query)
+                count, positions, walk = self.__queries[query]
+            else:
+                mask = None
+                for column, value in query[0]:
+                    bitmap = self.bitmaps(column).get(value, 0)
+                    mask = bitmap if mask is None else mask & bitmap
+                if mask is None:
+                    positions = range(len(self.dataset()))
+                    if sort_by is not None:
+                        positions = self.permutation(sort_by, descending)
+                    elif descending:
+                        positions = positions[::-1]
+                    count, walk = len(positions), None
+                else:
+                    count, positions = popcount(mask), []
+                    walk = self.walk(mask, sort_by, descending)
+                self.__queries[query] = (count, positions, walk)
+                if len(self.__queries) > self.QUERY_CACHE_SIZE:
+                    self.__queries.popitem(last=False)
+
+            if walk is not None and (end is None or len(positions) < end):
+                positions.extend(islice(walk, None if end is None
+                                        else end - len(positions)))
+        return count, positions
+
+    def get_hyper_query(self, page: int = 1, page_size: int = 10,
+                        filters: Optional[Dict[str, str]] = None,
+                        sort_by: Optional[str] = None,
+                        descending: bool = False) -> dict:
+        """Return a page of the rows matching every filter, sorted by
+        sort_by, with the pagination information of get_hyper."""
+        assert isinstance(page, int) and isinstance(page_size, int)
+        assert page > 0 and page_size > 0
+        filters = filters or {}
+        start, end = index_range(page, page_size)
+        count, positions = self.matches(filters, sort_by, descending, end)
+        dataset = self.dataset()
+        page_data = [dataset[p] for p in positions[start:end]]
+        total_pages = ceil(count / page_size)
+
+        return {
+            'page_size': len(page_data),
+            'page': page,
+            'data': page_data,
+            'next_page': page + 1 if page < total_pages else None,
+            'prev_page': page - 1 if page != 1 else None,
+            'total_pages': total_pages,
+            'filters': filters,
+            'sort_by': sort_by,
+        }
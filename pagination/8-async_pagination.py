@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Asyncio hypermedia pagination with prefetch of the next page.
+
+Pages are decoded by a synchronous backend server in the default
+executor. After serving a page, the decoding of next_page is scheduled
+in the background and kept in a small page cache, so a client scrolling
+forward finds its next page already decoded.
+"""
+import asyncio
+from collections import OrderedDict
+from math import ceil
+from typing import List, Tuple
+
+MmapServer = __import__('4-mmap_pagination').Server
+
+
+class Server:
+    """Server class for asynchronous pagination."""
+    PAGE_CACHE_SIZE = 8
+
+    def __init__(self, backend=None, prefetch: bool = True):
+        """backend is any server with get_page and dataset, the
+        memory-mapped server by default."""
+        self.backend = MmapServer() if backend is None else backend
+        self.prefetch = prefetch
+        self.__pages = OrderedDict()
+        self.__pending = {}
+        self.__dataset = None
+        self.__lock = None
+
+    async def dataset(self):
+        """Load the backend dataset once, in the executor, before any
+        page is decoded from it."""
+        if self.__dataset is None:
+            if self.__lock is None:
+                self.__lock = asyncio.Lock()
+            async with self.__lock:
+                if self.__dataset is None:
+                    loop = asyncio.get_running_loop()
+                    self.__dataset = await loop.run_in_executor(
+                        None, self.backend.dataset)
+        return self.__dataset
+
+    def __decode(self, key: Tuple[int, int]) -> asyncio.Future:
+        """Task decoding the page key = (page, page_size) once."""
+        task = self.__pending.get(key)
+        if task is None:
+            loop = asyncio.get_running_loop()
+            task = loop.run_in_executor(None, self.backend.get_page, *key)
+            self.__pending[key] = task
+            task.add_done_callback(lambda done: self.__store(key, done))
+        return task
+
+    def __store(self, key: Tuple[int, int], done: asyncio.Future) -> None:
+        """Move a decoded page from pending to the page cache."""
+        del self.__pending[key]
+        if done.cancelled() or done.exception() is not None:
+            return
+        self.__pages[key] = done.result()
+        if len(self.__pages) > self.PAGE_CACHE_SIZE:
+            self.__pages.popitem(last=False)
+
+    async def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
+        """Return a specific page of the dataset."""
+        assert isinstance(page, int) and isinstance(page_size, int)
+        assert page > 0 and page_size > 0
+        await self.dataset()
+        key = (page, page_size)
+        if key in self.__pages:
+            self.__pages.move_to_end(key)
+            return self.__pages[key]
+        return await asyncio.shield(self.__decode(key))
+
+    async def get_hyper(self, page: int = 1, page_size: int = 10) -> dict:
+        """Return a dictionary representing pagination information and
+        start decoding the next page."""
+        page_data = await self.get_page(page, page_size)
+        total_pages = ceil(len(await self.dataset()) / page_size)
+        next_page = page + 1 if page < total_pages else None
+        if (self.prefetch and next_page is not None and
+                (next_page, page_size) not in self.__pages):
+            self.__decode((next_page, page_size))
+
+        return {
+            'page_size': len(page_data),
+            'page': page,
+            'data': page_data,
+            'next_page': next_page,
+            'prev_page': page - 1 if page != 1 else None,
+            'total_pages': total_pages
+        }
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Hypermedia pagination over a dataset shared by every worker process.
+
+The columnar copy of the CSV (see 4-mmap_pagination) is loaded once into
+a named shared memory block; other workers attach to that same block
+and decode their pages from it, so the dataset is held once per host
+instead of once per worker. The block outlives the processes using it
+until close(unlink=True) is called, e.g. from the master's exit hook.
+"""
+import hashlib
+import os
+import time
+from math import ceil
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Optional
+
+mmap_pagination = __import__('4-mmap_pagination')
+ColumnarDataset = mmap_pagination.ColumnarDataset
+build_columnar = mmap_pagination.build_columnar
+is_stale = mmap_pagination.is_stale
+MAGIC = mmap_pagination.MAGIC
+index_range = __import__('0-simple_helper_function').index_range
+
+
+class Server:
+    """Server class for pagination from shared memory."""
+    DATA_FILE = "Popular_Baby_Names.csv"
+    ATTACH_TIMEOUT = 30
+
+    def __init__(self):
+        """Initialize the server instance."""
+        self.__dataset = None
+        self.__memory = None
+        self.created = False
+
+    @property
+    def columnar_file(self) -> str:
+        """Path of the converted dataset, next to the CSV."""
+        return self.DATA_FILE + ".col"
+
+    def block_name(self) -> str:
+        """Name of the shared block, changing whenever the file does."""
+        stat = os.stat(self.columnar_file)
+        source = "{}:{}:{}".format(os.path.abspath(self.columnar_file),
+                                   stat.st_mtime_ns, stat.st_size)
+        return "pbn_" + hashlib.sha1(source.encode()).hexdigest()[:16]
+
+    def __attach(self) -> shared_memory.SharedMemory:
+        """Attach to the shared block, creating and filling it first if
+        no worker did yet. The magic number is copied last, so workers
+        attaching meanwhile wait for it before reading."""
+        path = self.columnar_file
+        if is_stale(self.DATA_FILE, path):
+            build_columnar(self.DATA_FILE, path)
+        name, size = self.block_name(), os.path.getsize(path)
+        try:
+            memory = shared_memory.SharedMemory(name, create=True, size=size)
+            created = True
+        except FileExistsError:
+            memory = shared_memory.SharedMemory(name)
+            created = False
+        resource_tracker.unregister(memory._name, 'shared_memory')
+        if created:
+            with open(path, 'rb') as f:
+                f.seek(len(MAGIC))
+                f.readinto(memory.buf[len(MAGIC):size])
+                f.seek(0)
+                f.readinto(memory.buf[:len(MAGIC)])
+            self.created = True
+            return memory
+        deadline = time.monotonic() + self.ATTACH_TIMEOUT
+        while bytes(memory.buf[:len(MAGIC)]) != MAGIC:
+            if time.monotonic() > deadline:
+                memory.close()
+                raise TimeoutError("shared dataset never filled")
+            time.sleep(0.01)
+        return memory
+
+    def dataset(self) -> ColumnarDataset:
+        """Rows of the shared block."""
+        if self.__dataset is None:
+            self.__memory = self.__attach()
+            self.__dataset = ColumnarDataset(self.__memory.buf)
+        return self.__dataset
+
+    def close(self, unlink: Optional[bool] = None) -> None:
+        """Detach from the block; unlink it too, by default only from
+        the process that created it."""
+        if self.__memory is None:
+            return
+        self.__dataset.release()
+        self.__dataset = None
+        self.__memory.close()
+        if self.created if unlink is None else unlink:
+            resource_tracker.register(self.__memory._name, 'shared_memory')
+            self.__memory.unlink()
+        self.__memory = None
+
+    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
+        """Return a specific page of the dataset."""
+        assert isinstance(page, int) and isinstance(page_size, int)
+        assert page > 0 and page_size > 0
+        start, end = index_range(page, page_size)
+        return self.dataset()[start:end]
+
+    def get_hyper(self, page: int = 1, page_size: int = 10) -> dict:
+        """Return a dictionary representing pagination information."""
+        page_data = self.get_page(page, page_size)
+        total_pages = ceil(len(self.dataset()) / page_size)
+
+        return {
+            'page_size': len(page_data),
+            'page': page,
+            'data': page_data,
+            'next_page': page + 1 if page < total_pages else None,
+            'prev_page': page - 1 if page != 1 else None,
+            'total_pages': total_pages
+        }
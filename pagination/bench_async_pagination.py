@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark of sequential scroll latency with and without prefetch
+"""
+import asyncio
+import csv
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+AsyncServer = __import__('8-async_pagination').Server
+MmapServer = __import__('4-mmap_pagination').Server
+
+ROWS = 200000
+PAGE_SIZE = 2000
+PAGES = 60
+THINK_TIME = 0.005
+
+
+def make_dataset(path: str) -> None:
+    """Write a baby-names-like CSV of ROWS rows."""
+    rand = random.Random(0)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Year of Birth", "Gender", "Ethnicity",
+                         "Child's First Name", "Count", "Rank"])
+        for i in range(ROWS):
+            writer.writerow([rand.choice([2011, 2012, 2013, 2014]),
+                             rand.choice(['FEMALE', 'MALE']),
+                             rand.choice(['HISPANIC', 'WHITE NON HISPANIC']),
+                             "Name{}".format(i % 997),
+                             rand.randint(10, 300), rand.randint(1, 100)])
+
+
+async def scroll(server: AsyncServer) -> List[float]:
+    """Read PAGES pages in order, pausing THINK_TIME between them, and
+    return the latency of each get_hyper call."""
+    latencies = []
+    for page in range(1, PAGES + 1):
+        start = time.perf_counter()
+        await server.get_hyper(page, PAGE_SIZE)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(THINK_TIME)
+    return latencies
+
+
+if __name__ == "__main__":
+    directory = tempfile.mkdtemp()
+    MmapServer.DATA_FILE = os.path.join(directory, "Popular_Baby_Names.csv")
+    make_dataset(MmapServer.DATA_FILE)
+    MmapServer().dataset()
+    for prefetch in (False, True):
+        latencies = asyncio.run(scroll(AsyncServer(prefetch=prefetch)))
+        latencies.sort()
+        print("prefetch={!s:<5} mean {:7.3f} ms  p50 {:7.3f} ms  "
+              "p99 {:7.3f} ms".format(
+                  prefetch, sum(latencies) / len(latencies) * 1e3,
+                  latencies[len(latencies) // 2] * 1e3,
+                  latencies[int(len(latencies) * 0.99)] * 1e3))
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Benchmark of deletion-resilient pagination under heavy delete churn
+"""
+import random
+import time
+from typing import List
+
+LiveIndex = __import__('3-hypermedia_del_pagination').LiveIndex
+
+ROWS = 1000000
+PAGES = 20000
+PAGE_SIZE = 10
+
+
+def churn(index: LiveIndex, deletes: int, rand: random.Random) -> float:
+    """Delete random live positions, re-insert a tenth of them, and
+    return the mean cost of one operation in microseconds."""
+    positions = rand.sample(list(index.keys()), deletes)
+    start = time.perf_counter()
+    for position in positions:
+        del index[position]
+    for position in positions[::10]:
+        index[position] = ['reinserted']
+    elapsed = time.perf_counter() - start
+    return elapsed / (deletes + len(positions[::10])) * 1e6
+
+
+def pages(index: LiveIndex, rand: random.Random) -> float:
+    """Return the mean cost of one page in microseconds."""
+    starts: List[int] = [rand.randrange(index.positions)
+                         for _ in range(PAGES)]
+    start = time.perf_counter()
+    for position in starts:
+        index.page(position, PAGE_SIZE)
+    return (time.perf_counter() - start) / PAGES * 1e6
+
+
+if __name__ == "__main__":
+    rand = random.Random(0)
+    index = LiveIndex([[i] for i in range(ROWS)])
+    print("{:>8} {:>12} {:>14}".format('deleted', 'us/update', 'us/page'))
+    for fraction in (0, 0.25, 0.5, 0.9, 0.99):
+        deletes = int(ROWS * fraction) - (ROWS - len(index))
+        cost = churn(index, deletes, rand) if deletes > 0 else 0.0
+        print("{:>7.0%} {:>12.2f} {:>14.2f}".format(
+            1 - len(index) / ROWS, cost, pages(index, rand)))